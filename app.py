@@ -18,6 +18,7 @@ from components.theme import inject_global_css
 from components.sidebar import render_sidebar
 from data.auth_repo import ensure_admin_exists
 from data.auth_repo import parse_login_token, get_active_user_by_username
+from state.save_manager import flush_pending_save
 from security.rbac import (
     load_permissions_for_session,
     get_allowed_navigation,
@@ -84,9 +85,7 @@ def _ensure_permissions_loaded() -> None:
     user_id = str(st.session_state.get("current_user_id", "") or "").strip()
     if not role:
         return
-    marker = f"{role}:{user_id}"
-    if st.session_state.get("permissions_loaded_for") != marker:
-        load_permissions_for_session(role, user_id or None)
+    load_permissions_for_session(role, user_id or None, refresh=False)
 
 
 def main() -> None:
@@ -117,6 +116,9 @@ def main() -> None:
     # Load schedule into session state if not already loaded
     _ensure_schedule_loaded()
 
+    # Write any edits queued by the auto-save debounce in one batch
+    flush_pending_save()
+
     df = st.session_state.get("df")
 
     # Render sidebar (navigation + punch widget + duties + save controls + reminders)
@@ -131,13 +133,8 @@ def _ensure_schedule_loaded() -> None:
     if st.session_state.get("df") is not None:
         return
     try:
-        from data.schedule_repo import load_schedule
-        from services.schedule_ops import ensure_schedule_columns, ensure_row_ids, add_computed_columns
-        df = load_schedule()
-        df = ensure_schedule_columns(df)
-        df = ensure_row_ids(df)
-        df = add_computed_columns(df)
-        st.session_state.df = df
+        from data.schedule_repo import get_prepared_schedule
+        st.session_state.df = get_prepared_schedule()
     except Exception as e:
         st.error(f"Failed to load schedule: {e}")
         import pandas as pd
@@ -148,7 +145,7 @@ def _ensure_schedule_loaded() -> None:
 def _route() -> None:
     """Determine current page from session state and render it."""
     role = st.session_state.get("user_role", "assistant")
-    allowed_nav = get_allowed_navigation(role, st.session_state.get("allowed_functions", []))
+    allowed_nav = get_allowed_navigation(role)
     if not allowed_nav:
         st.error("No accessible functions are assigned to this user.")
         st.stop()
@@ -50,6 +50,7 @@ def _render_header() -> None:
                 st.session_state.current_user = None
                 st.session_state.current_user_id = None
                 st.session_state.allowed_functions = []
+                st.session_state.allowed_functions_set = None
                 st.session_state.permissions_loaded_for = None
                 try:
                     if "auth" in st.query_params:
@@ -64,7 +65,7 @@ def _render_navigation() -> None:
 
     # Get allowed categories based on effective RBAC permissions
     user_role = st.session_state.get("user_role", "assistant")
-    role_nav = get_allowed_navigation(user_role, st.session_state.get("allowed_functions", []))
+    role_nav = get_allowed_navigation(user_role)
     if not role_nav:
         st.warning("No accessible menu items.")
         return
@@ -1,6 +1,7 @@
 # config/constants.py
 """All hardcoded constants: colors, status options, column definitions."""
 
+import re
 from typing import Any
 
 # ── UI Color Palette (Medical Blue Glassmorphism) ─────────────────────────────
@@ -45,6 +46,9 @@ STATUS_COLORS = {
 }
 
 TERMINAL_STATUSES = {"DONE", "COMPLETED", "CANCELLED", "SHIFTED"}
+# Substring match: stored statuses may carry text around the terminal keyword.
+TERMINAL_STATUS_RE = re.compile("|".join(re.escape(s) for s in sorted(TERMINAL_STATUSES)))
+ONGOING_STATUSES = {"ON GOING", "ONGOING"}
 
 # ── Schedule Columns ──────────────────────────────────────────────────────────
 SCHEDULE_COLUMNS = [
@@ -73,6 +77,7 @@ DUTY_RUNS_COLUMNS = ["id", "date", "assistant", "duty_id", "status", "started_at
 
 # ── OP Rooms ──────────────────────────────────────────────────────────────────
 OP_ROOMS = ["OP1", "OP2", "OP3", "OP4"]
+OP_ROOMS_SORTED: tuple[str, ...] = tuple(sorted(o for o in OP_ROOMS if o))
 
 # ── Weekday names ─────────────────────────────────────────────────────────────
 WEEKDAY_NAMES = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
@@ -40,6 +40,8 @@ EXCEL_PATIENTS_SHEET = "Patients"
 SUPABASE_CHECK_TTL_SECONDS = 60
 PROFILE_CACHE_TTL_SECONDS = 120
 SCHEDULE_CACHE_TTL_SECONDS = 60
+# Auto-save writes queued edits once this many pile up within the debounce window.
+SAVE_BATCH_MAX_CHANGES = 5
 
 # ── Scheduling debug and date handling ────────────────────────────────────────
 # Keep UI debug output disabled in production; enable only when troubleshooting.
@@ -0,0 +1 @@
+# Lets pytest import the app packages (services, config, ...) from the repo root.
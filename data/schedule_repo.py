@@ -20,6 +20,7 @@ from config.settings import (
 from config.constants import SCHEDULE_COLUMNS
 from data.supabase_client import get_supabase_client
 from data.excel_ops import load_sheet, save_sheet
+from services.schedule_ops import prepare_schedule, detach_attrs, INTERNAL_COLUMNS
 
 
 def _get_expected_columns() -> list[str]:
@@ -33,6 +34,17 @@ def _ensure_columns(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+# Stored Arrow-backed so .str.strip()/.str.lower() run as Arrow compute kernels.
+_ARROW_STRING_COLUMNS = ("DATE",)
+
+
+def _coerce_string_columns(df: pd.DataFrame) -> pd.DataFrame:
+    for col in _ARROW_STRING_COLUMNS:
+        if col in df.columns:
+            df[col] = df[col].astype("string[pyarrow]")
+    return df
+
+
 def load_appointments_by_date(selected_date: date_type) -> pd.DataFrame:
     """Fetch appointments for one selected day from Supabase (no caching)."""
     if not USE_SUPABASE:
@@ -157,11 +169,13 @@ def _load_from_supabase_cached(url: str, key: str, table: str, row_id: str) -> O
             if col not in columns:
                 columns.append(col)
         rows = payload.get("rows") or []
-        df = pd.DataFrame(rows)
+        # Project while building the frame: keys outside ``columns`` are never materialized.
+        df = pd.DataFrame.from_records(rows, columns=columns) if rows else pd.DataFrame(columns=columns)
+        # Blank-fill only the columns no row carries (the ones from_records invented).
+        present = set().union(*rows)
         for col in columns:
-            if col not in df.columns:
+            if col not in present:
                 df[col] = ""
-        df = df[columns]
         meta = payload.get("meta")
         if isinstance(meta, dict):
             df.attrs["meta"] = dict(meta)
@@ -178,18 +192,42 @@ def load_schedule() -> pd.DataFrame:
         if url and key:
             df = _load_from_supabase_cached(url, key, table, row_id)
             if df is not None:
-                return _ensure_columns(df)
+                return _coerce_string_columns(_ensure_columns(df))
     df = load_sheet(EXCEL_SCHEDULE_SHEET, _get_expected_columns())
-    return _ensure_columns(df)
+    return _coerce_string_columns(_ensure_columns(df))
+
+
+@st.cache_resource(ttl=SCHEDULE_CACHE_TTL_SECONDS, show_spinner=False)
+def _load_prepared_shared() -> pd.DataFrame:
+    return prepare_schedule(load_schedule())
+
+
+def get_prepared_schedule() -> pd.DataFrame:
+    """Load the schedule with prepare_schedule already applied.
+
+    Loading and preparing run once per TTL for the whole process; each caller
+    gets its own copy with its own attrs (meta included), so one session's
+    edits and saves never reach another or the shared frame.
+    """
+    return prepare_schedule(detach_attrs(_load_prepared_shared().copy()))
 
 
 def save_schedule(df: pd.DataFrame) -> bool:
-    """Persist the schedule DataFrame."""
+    """Persist the schedule DataFrame (internal epoch columns are left out)."""
+    internal = [col for col in INTERNAL_COLUMNS if col in df.columns]
+    if internal:
+        df = df.drop(columns=internal)
     if USE_SUPABASE:
         url, key, table, row_id, _ = get_supabase_config()
         if url and key:
-            return _save_to_supabase(url, key, table, row_id, df)
-    return save_sheet(df, EXCEL_SCHEDULE_SHEET)
+            saved = _save_to_supabase(url, key, table, row_id, df)
+            if saved:
+                _load_prepared_shared.clear()
+            return saved
+    saved = save_sheet(df, EXCEL_SCHEDULE_SHEET)
+    if saved:
+        _load_prepared_shared.clear()
+    return saved
 
 
 def _save_to_supabase(url: str, key: str, table: str, row_id: str, df: pd.DataFrame) -> bool:
@@ -256,3 +294,7 @@ def clear_schedule_cache() -> None:
         _load_from_supabase_cached.clear()
     except Exception:
         pass
+    try:
+        _load_prepared_shared.clear()
+    except Exception:
+        pass
@@ -6,6 +6,7 @@ import streamlit as st
 import pandas as pd
 
 from services.schedule_ops import ensure_schedule_columns, add_computed_columns, compute_workload_summary
+from data.schedule_repo import clear_schedule_cache
 from services.profiles_cache import get_profiles_cache
 
 
@@ -40,7 +41,7 @@ def render() -> None:
 
     if st.button("🔄 Refresh", key="workload_refresh"):
         st.session_state.df = None
-        st.cache_data.clear()
+        clear_schedule_cache()
         st.rerun()
 
     workload_df = compute_workload_summary(df, assistants)
@@ -6,6 +6,7 @@ import streamlit as st
 import pandas as pd
 
 from services.schedule_ops import ensure_schedule_columns, add_computed_columns
+from data.schedule_repo import clear_schedule_cache
 from services.profiles_cache import get_profiles_cache, get_department_for_doctor
 from services.utils import coerce_to_time_obj, time_to_12h, norm_name, norm_name
 
@@ -501,5 +502,5 @@ def render() -> None:
     # ── Refresh button ─────────────────────────────────────────────────────────
     if st.button("🔄 Refresh", key="dr_my_workload_refresh"):
         st.session_state.df = None
-        st.cache_data.clear()
+        clear_schedule_cache()
         st.rerun()
@@ -6,11 +6,12 @@ import streamlit as st
 
 from services.schedule_ops import (
     ensure_schedule_columns, ensure_row_ids, add_computed_columns,
-    filter_by_doctor, update_status,
+    filter_by_doctor, update_status, delete_row,
 )
 from services.profiles_cache import get_profiles_cache
 from state.save_manager import maybe_save
 from components.schedule_card import render_schedule_card
+from data.schedule_repo import clear_schedule_cache
 
 
 def render() -> None:
@@ -47,7 +48,7 @@ def render() -> None:
     with col_refresh:
         if st.button("🔄", width='stretch', key="per_dr_refresh"):
             st.session_state.df = None
-            st.cache_data.clear()
+            clear_schedule_cache()
             st.rerun()
 
     filtered = filter_by_doctor(df, selected_dr)
@@ -87,9 +88,7 @@ def _on_status_change(df, row_id: str, new_status: str) -> None:
 
 
 def _on_delete(df, row_id: str) -> None:
-    mask = df["REMINDER_ROW_ID"].astype(str).str.strip() == row_id
-    updated = df[~mask].reset_index(drop=True)
-    updated.attrs = df.attrs.copy()
+    updated = delete_row(df, row_id)
     st.session_state.df = updated
     maybe_save(updated, message="Row deleted")
     st.rerun()
@@ -6,6 +6,7 @@ import streamlit as st
 import pandas as pd
 
 from services.schedule_ops import ensure_schedule_columns, add_computed_columns
+from data.schedule_repo import clear_schedule_cache
 from data.profile_repo import load_doctors
 
 
@@ -27,7 +28,7 @@ def render() -> None:
 
     if st.button("🔄 Refresh", key="dr_summary_refresh"):
         st.session_state.df = None
-        st.cache_data.clear()
+        clear_schedule_cache()
         st.rerun()
 
     if "DR." not in df_sched.columns or df_sched.empty:
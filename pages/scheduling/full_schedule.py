@@ -2,17 +2,25 @@
 """Full Schedule view — card + table toggle, add/edit/delete, auto-allocate."""
 
 from __future__ import annotations
+from datetime import datetime
 import pandas as pd
 import streamlit as st
 
-from data.schedule_repo import load_schedule, clear_schedule_cache
+from data.schedule_repo import get_prepared_schedule, clear_schedule_cache
 from data.profile_repo import load_assistants, load_doctors
+from data.attendance_repo import get_today_punch_map
 from services.schedule_ops import (
-    ensure_schedule_columns,
-    ensure_row_ids,
+    prepare_schedule,
     update_status,
-    add_computed_columns,
+    delete_row,
+    clear_derived_attrs,
+    find_row_position,
+    strict_date_mask,
+    DATE_ISO_ATTR,
 )
+from services.allocation_engine import auto_allocate_all
+from services.availability import deserialize_time_blocks, serialize_time_blocks
+from services.utils import now_ist
 from services.profiles_cache import (
     get_profiles_cache,
     get_all_assistants,
@@ -22,50 +30,13 @@ from state.save_manager import maybe_save, queue_unsaved
 from components.schedule_card import render_schedule_card, render_add_appointment_form
 from components.schedule_table import render_schedule_table, render_edit_row_form
 from components.time_block_editor import render_time_block_editor
-from config.constants import OP_ROOMS
+from config.constants import OP_ROOMS_SORTED
+from config.settings import IST
 from security.rbac import has_access, require_access
 
 
-def _strict_date_mask(date_series: pd.Series, selected_date) -> tuple[pd.Series, str]:
-    """Build strict date match mask with tolerant normalization for legacy date strings."""
-    target_dt = pd.to_datetime(selected_date, errors="coerce")
-    if pd.isna(target_dt):
-        return pd.Series(False, index=date_series.index), ""
-
-    formatted_date = target_dt.strftime("%Y-%m-%d")
-    raw_dates = date_series.fillna("").astype(str).str.strip()
-    raw_lower = raw_dates.str.lower()
-
-    # Direct match handles ISO DATE and ISO TIMESTAMP strings.
-    direct_match = (
-        raw_dates.eq(formatted_date)
-        | raw_dates.str.startswith(f"{formatted_date}T")
-        | raw_dates.str.startswith(f"{formatted_date} ")
-    )
-
-    parse_input = raw_dates.where(~raw_lower.isin(["", "nan", "none", "nat"]))
-    normalized_default = pd.to_datetime(parse_input, errors="coerce").dt.strftime("%Y-%m-%d")
-    normalized_dayfirst = pd.to_datetime(parse_input, errors="coerce", dayfirst=True).dt.strftime("%Y-%m-%d")
-
-    # Support legacy Excel serial dates if any historical rows were imported that way.
-    numeric_dates = pd.to_numeric(parse_input, errors="coerce")
-    normalized_excel = pd.to_datetime(
-        numeric_dates, unit="D", origin="1899-12-30", errors="coerce"
-    ).dt.strftime("%Y-%m-%d")
-
-    mask = (
-        direct_match
-        | normalized_default.eq(formatted_date)
-        | normalized_dayfirst.eq(formatted_date)
-        | normalized_excel.eq(formatted_date)
-    )
-    return mask.fillna(False), formatted_date
-
-
 def render() -> None:
     # ── Initialize selected date to TODAY in IST (always reset on page load) ─────
-    from datetime import datetime
-    from config.settings import IST
     today = datetime.now(IST).date()
     st.session_state.selected_schedule_date = today
 
@@ -121,19 +92,17 @@ def render() -> None:
     df = st.session_state.get("df")
     if df is None:
         with st.spinner("Loading schedule…"):
-            df = load_schedule()
+            df = get_prepared_schedule()
         st.session_state.df = df
 
-    df = ensure_schedule_columns(df)
-    df = ensure_row_ids(df)
-    df = add_computed_columns(df)
+    df = prepare_schedule(df)
     st.session_state.df = df
 
     cache_bust = st.session_state.get("profiles_cache_bust", 0)
     cache = get_profiles_cache(cache_bust)
     doctors = sorted(cache.get("doctors_list") or [])
     assistants = sorted(cache.get("assistants_list") or [])
-    op_rooms = sorted(OP_ROOMS)
+    op_rooms = list(OP_ROOMS_SORTED)
 
     # ── Toolbar ────────────────────────────────────────────────────────────────
     col_view, col_search, col_alloc, col_refresh = st.columns([2, 3, 2, 1])
@@ -160,7 +129,7 @@ def render() -> None:
     with col_refresh:
         if st.button("🔄", width='stretch', key="btn_sched_refresh", help="Refresh"):
             st.session_state.df = None
-            st.cache_data.clear()
+            clear_schedule_cache()
             st.rerun()
 
     # ── Optional: time block editor ───────────────────────────────────────────
@@ -171,7 +140,6 @@ def render() -> None:
         else:
             meta = getattr(df, "attrs", {}).get("meta", {})
             time_blocks = meta.get("time_blocks", [])
-            from services.availability import deserialize_time_blocks, serialize_time_blocks
             time_blocks = deserialize_time_blocks(time_blocks)
             render_time_block_editor(
                 time_blocks=time_blocks,
@@ -187,10 +155,10 @@ def render() -> None:
     if selected_date and ("DATE" in view_df.columns or "appointment_date" in view_df.columns):
         date_series = view_df["DATE"] if "DATE" in view_df.columns else pd.Series([""] * len(view_df), index=view_df.index)
         if "appointment_date" in view_df.columns:
-            primary = date_series.fillna("").astype(str).str.strip()
-            fallback = view_df["appointment_date"].fillna("").astype(str).str.strip()
+            primary = date_series.astype("string[pyarrow]").fillna("").str.strip()
+            fallback = view_df["appointment_date"].astype("string[pyarrow]").fillna("").str.strip()
             date_series = primary.where(primary.ne(""), fallback)
-        date_mask, _ = _strict_date_mask(date_series, selected_date)
+        date_mask, _ = strict_date_mask(date_series, selected_date, iso_only=bool(view_df.attrs.get(DATE_ISO_ATTR)))
         view_df = view_df[date_mask].copy()
 
     # ── Filter by search query ──────────────────────────────────────────────────
@@ -281,10 +249,7 @@ def _on_status_change(df, row_id: str, new_status: str) -> None:
 
 def _on_delete_row(df, row_id: str) -> None:
     require_access("action::schedule::delete_appointment", "deleting appointments")
-    import pandas as pd
-    mask = df["REMINDER_ROW_ID"].astype(str).str.strip() == row_id
-    updated = df[~mask].reset_index(drop=True)
-    updated.attrs = df.attrs.copy()
+    updated = delete_row(df, row_id)
     st.session_state.df = updated
     maybe_save(updated, message="Row deleted")
     st.rerun()
@@ -292,10 +257,10 @@ def _on_delete_row(df, row_id: str) -> None:
 
 def _on_add_appointment(df, row: dict) -> None:
     require_access("action::schedule::add_appointment", "adding appointments")
-    import pandas as pd
     new_row_df = pd.DataFrame([row])
     updated = pd.concat([df, new_row_df], ignore_index=True)
     updated.attrs = df.attrs.copy()
+    clear_derived_attrs(updated)
     st.session_state.df = updated
     maybe_save(updated, message="Appointment added")
     st.rerun()
@@ -303,12 +268,13 @@ def _on_add_appointment(df, row: dict) -> None:
 
 def _on_edit_row(df, row_id: str, updates: dict) -> None:
     require_access("action::schedule::edit_appointment", "editing appointments")
-    mask = df["REMINDER_ROW_ID"].astype(str).str.strip() == row_id
-    idxs = df.index[mask].tolist()
-    if idxs:
+    pos = find_row_position(df, row_id)
+    if pos is not None:
+        label = df.index[pos]
         for col, val in updates.items():
             if col in df.columns:
-                df.loc[idxs[0], col] = val
+                df.loc[label, col] = val
+        clear_derived_attrs(df)
     st.session_state.df = df
     st.session_state[f"editing_row_{row_id}"] = False
     maybe_save(df, message="Appointment updated")
@@ -326,6 +292,7 @@ def _on_table_save(full_df, view_df, updated_view) -> None:
     for col in updated_view.columns:
         if col in full_df.columns and col in view_df.columns:
             full_df.loc[view_df.index, col] = updated_view[col].values
+    clear_derived_attrs(full_df)
     st.session_state.df = full_df
     maybe_save(full_df, message="Table edited")
     st.rerun()
@@ -333,14 +300,9 @@ def _on_table_save(full_df, view_df, updated_view) -> None:
 
 def _run_auto_allocate(df) -> None:
     require_access("action::schedule::auto_allocate", "auto-allocation")
-    from services.allocation_engine import auto_allocate_all
-    from data.attendance_repo import get_today_punch_map
-    from services.utils import now_ist
-
     today_str = now_ist().date().isoformat()
     punch_map = get_today_punch_map(today_str)
     meta = getattr(df, "attrs", {}).get("meta", {})
-    from services.availability import deserialize_time_blocks
     time_blocks = deserialize_time_blocks(meta.get("time_blocks", []))
 
     updated, changed = auto_allocate_all(
@@ -355,7 +317,6 @@ def _run_auto_allocate(df) -> None:
 
 def _add_time_block(df, block: dict) -> None:
     require_access("action::schedule::time_blocks", "managing time blocks")
-    from services.availability import deserialize_time_blocks, serialize_time_blocks
     meta = df.attrs.get("meta", {})
     time_blocks = deserialize_time_blocks(meta.get("time_blocks", []))
     time_blocks.append(block)
@@ -368,7 +329,6 @@ def _add_time_block(df, block: dict) -> None:
 
 def _remove_time_block(df, idx: int, time_blocks: list) -> None:
     require_access("action::schedule::time_blocks", "managing time blocks")
-    from services.availability import serialize_time_blocks
     if 0 <= idx < len(time_blocks):
         time_blocks.pop(idx)
     meta = df.attrs.get("meta", {})
@@ -12,11 +12,15 @@ import pandas as pd
 
 # Import the new function
 from data.schedule_repo import load_appointments_by_date, clear_schedule_cache
+from config.settings import SCHEDULE_UI_DEBUG
 
 # ── Page Configuration ──────────────────────────────────────────────────────
 st.set_page_config(page_title="Full Schedule", layout="wide")
 st.markdown("## 📅 Full Schedule")
 
+# Debug output is off unless SCHEDULE_UI_DEBUG is set or the checkbox below is ticked.
+show_debug = SCHEDULE_UI_DEBUG or st.session_state.get("_show_debug", False)
+
 # ╔════════════════════════════════════════════════════════════════════════════╗
 # ║ CORRECTED APPROACH: Initialize & Handle Date Selection                    ║
 # ╠════════════════════════════════════════════════════════════════════════════╣
@@ -25,7 +29,8 @@ st.markdown("## 📅 Full Schedule")
 # This persists the date across reruns
 if "selected_schedule_date" not in st.session_state:
     st.session_state.selected_schedule_date = date.today()
-    st.write("🆕 **DEBUG:** Initialized date to today")
+    if show_debug:
+        st.write("🆕 **DEBUG:** Initialized date to today")
 
 # ── Step 2: Create date picker ──────────────────────────────────────────────
 st.markdown("### 📆 Select Date")
@@ -39,7 +44,8 @@ selected_date = st.date_input(
 # ── Step 3: CRITICAL - Check if date changed and clear cache ────────────────
 # This ensures that when user picks a new date, we fetch fresh data
 if selected_date != st.session_state.selected_schedule_date:
-    st.write(f"📅 **DEBUG:** Date changed from {st.session_state.selected_schedule_date} → {selected_date}")
+    if show_debug:
+        st.write(f"📅 **DEBUG:** Date changed from {st.session_state.selected_schedule_date} → {selected_date}")
     st.session_state.selected_schedule_date = selected_date
     clear_schedule_cache()  # Clear cached data
     st.rerun()  # Force re-fetch
@@ -108,9 +114,7 @@ with col_refresh:
         st.rerun()
 
 with col_debug:
-    show_debug = st.checkbox("🐛 Show debug info", value=True)
-    if not show_debug:
-        st.write("**Debug messages above will be hidden once refreshed**")
+    st.checkbox("🐛 Show debug info", value=SCHEDULE_UI_DEBUG, key="_show_debug")
 
 # ──────────────────────────────────────────────────────────────────────────────
 # TROUBLESHOOTING GUIDE
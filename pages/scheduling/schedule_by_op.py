@@ -2,61 +2,52 @@
 """Schedule filtered by OP room."""
 
 from __future__ import annotations
+from datetime import datetime
 import pandas as pd
 import streamlit as st
 
 from services.schedule_ops import (
-    ensure_schedule_columns, ensure_row_ids, add_computed_columns,
-    update_status, filter_by_op,
+    prepare_schedule,
+    update_status, filter_by_op, delete_row, clear_derived_attrs,
+    get_op_options, strict_date_mask, DATE_ISO_ATTR,
 )
 from state.save_manager import maybe_save
 from components.schedule_card import render_schedule_card, render_add_appointment_form
-from config.constants import OP_ROOMS
+from config.settings import IST
 from services.profiles_cache import get_profiles_cache
-from data.schedule_repo import clear_schedule_cache
+from data.schedule_repo import clear_schedule_cache, get_prepared_schedule
 from security.rbac import has_access, require_access
 
 
-def _strict_date_mask(date_series: pd.Series, selected_date) -> tuple[pd.Series, str]:
-    """Build strict date match mask with tolerant normalization for legacy date strings."""
-    target_dt = pd.to_datetime(selected_date, errors="coerce")
-    if pd.isna(target_dt):
-        return pd.Series(False, index=date_series.index), ""
-
-    formatted_date = target_dt.strftime("%Y-%m-%d")
-    raw_dates = date_series.fillna("").astype(str).str.strip()
-    raw_lower = raw_dates.str.lower()
-
-    direct_match = (
-        raw_dates.eq(formatted_date)
-        | raw_dates.str.startswith(f"{formatted_date}T")
-        | raw_dates.str.startswith(f"{formatted_date} ")
-    )
-
-    parse_input = raw_dates.where(~raw_lower.isin(["", "nan", "none", "nat"]))
-    normalized_default = pd.to_datetime(parse_input, errors="coerce").dt.strftime("%Y-%m-%d")
-    normalized_dayfirst = pd.to_datetime(parse_input, errors="coerce", dayfirst=True).dt.strftime("%Y-%m-%d")
+def _sorted_profiles(cache_bust: int) -> tuple[tuple[str, ...], tuple[str, ...]]:
+    """Sorted (doctors, assistants) names, memoized on this session's profiles cache."""
+    cache = get_profiles_cache(cache_bust)
+    names = cache.get("_sorted_names")
+    if names is None:
+        names = cache["_sorted_names"] = (
+            tuple(sorted(cache.get("doctors_list") or [])),
+            tuple(sorted(cache.get("assistants_list") or [])),
+        )
+    return names
 
-    numeric_dates = pd.to_numeric(parse_input, errors="coerce")
-    normalized_excel = pd.to_datetime(
-        numeric_dates, unit="D", origin="1899-12-30", errors="coerce"
-    ).dt.strftime("%Y-%m-%d")
 
-    mask = (
-        direct_match
-        | normalized_default.eq(formatted_date)
-        | normalized_dayfirst.eq(formatted_date)
-        | normalized_excel.eq(formatted_date)
-    )
-    return mask.fillna(False), formatted_date
+def _filter_by_date(frame: pd.DataFrame, selected_date) -> pd.DataFrame:
+    """Strict date filter; do not include blank dates."""
+    if not selected_date or ("DATE" not in frame.columns and "appointment_date" not in frame.columns):
+        return frame
+    date_series = frame["DATE"] if "DATE" in frame.columns else pd.Series([""] * len(frame), index=frame.index)
+    if "appointment_date" in frame.columns:
+        primary = date_series.astype("string[pyarrow]").fillna("").str.strip()
+        fallback = frame["appointment_date"].astype("string[pyarrow]").fillna("").str.strip()
+        date_series = primary.where(primary.ne(""), fallback)
+    date_mask, _ = strict_date_mask(date_series, selected_date, iso_only=bool(frame.attrs.get(DATE_ISO_ATTR)))
+    return frame[date_mask].copy()
 
 
 def render() -> None:
     st.markdown("## 🏥 Schedule by OP Room")
 
     # ── Initialize selected date to TODAY in IST (always reset on page load) ─────
-    from datetime import datetime
-    from config.settings import IST
     today = datetime.now(IST).date()
     st.session_state.schedule_by_op_date = today
 
@@ -81,23 +72,16 @@ def render() -> None:
     # ── Load data ──────────────────────────────────────────────────────────────
     df = st.session_state.get("df")
     if df is None:
-        from data.schedule_repo import load_schedule
-        df = load_schedule()
+        df = get_prepared_schedule()
         st.session_state.df = df
 
-    df = ensure_schedule_columns(df)
-    df = ensure_row_ids(df)
-    df = add_computed_columns(df)
+    df = prepare_schedule(df)
     st.session_state.df = df
 
-    cache = get_profiles_cache(st.session_state.get("profiles_cache_bust", 0))
-    doctors = sorted(cache.get("doctors_list") or [])
-    assistants = sorted(cache.get("assistants_list") or [])
+    doctors, assistants = _sorted_profiles(st.session_state.get("profiles_cache_bust", 0))
 
     # OP room selector
-    all_ops = sorted(df["OP"].dropna().astype(str).str.strip().unique().tolist()) if "OP" in df.columns else []
-    all_ops = sorted(set(all_ops + OP_ROOMS))
-    all_ops = [o for o in all_ops if o]
+    all_ops = get_op_options(df)
 
     col_op, col_refresh = st.columns([4, 1])
     with col_op:
@@ -105,26 +89,16 @@ def render() -> None:
     with col_refresh:
         if st.button("🔄", width='stretch', key="op_refresh"):
             st.session_state.df = None
-            st.cache_data.clear()
+            clear_schedule_cache()
             st.rerun()
 
     # ── Filter by date and OP ──────────────────────────────────────────────────
-    filtered = filter_by_op(df, selected_op)
-
-    # Strict date filter; do not include blank dates.
-    if selected_date and ("DATE" in filtered.columns or "appointment_date" in filtered.columns):
-        date_series = filtered["DATE"] if "DATE" in filtered.columns else pd.Series([""] * len(filtered), index=filtered.index)
-        if "appointment_date" in filtered.columns:
-            primary = date_series.fillna("").astype(str).str.strip()
-            fallback = filtered["appointment_date"].fillna("").astype(str).str.strip()
-            date_series = primary.where(primary.ne(""), fallback)
-        date_mask, _ = _strict_date_mask(date_series, selected_date)
-        filtered = filtered[date_mask].copy()
+    filtered = _filter_by_date(filter_by_op(df, selected_op), selected_date)
 
     if has_access("action::schedule::add_appointment"):
         render_add_appointment_form(
-            doctors=doctors,
-            assistants=assistants,
+            doctors=list(doctors),
+            assistants=list(assistants),
             op_rooms=all_ops,
             selected_date=selected_date,
             on_save=lambda row: _on_add(df, row),
@@ -161,9 +135,7 @@ def _on_status_change(df, row_id: str, new_status: str) -> None:
 
 def _on_delete(df, row_id: str) -> None:
     require_access("action::schedule::delete_appointment", "deleting appointments")
-    mask = df["REMINDER_ROW_ID"].astype(str).str.strip() == row_id
-    updated = df[~mask].reset_index(drop=True)
-    updated.attrs = df.attrs.copy()
+    updated = delete_row(df, row_id)
     st.session_state.df = updated
     maybe_save(updated, message="Row deleted")
     st.rerun()
@@ -171,9 +143,9 @@ def _on_delete(df, row_id: str) -> None:
 
 def _on_add(df, row: dict) -> None:
     require_access("action::schedule::add_appointment", "adding appointments")
-    import pandas as pd
     updated = pd.concat([df, pd.DataFrame([row])], ignore_index=True)
     updated.attrs = df.attrs.copy()
+    clear_derived_attrs(updated)
     st.session_state.df = updated
     maybe_save(updated, message="Appointment added")
     st.rerun()
@@ -5,11 +5,13 @@ from __future__ import annotations
 import streamlit as st
 
 from services.schedule_ops import (
-    ensure_schedule_columns, ensure_row_ids, add_computed_columns,
-    filter_upcoming, update_status,
+    prepare_schedule,
+    filter_upcoming, update_status, delete_row,
 )
 from state.save_manager import maybe_save
 from components.schedule_card import render_schedule_card
+from data.schedule_repo import clear_schedule_cache, get_prepared_schedule
+from services.utils import now_ist
 
 
 def render() -> None:
@@ -17,22 +19,10 @@ def render() -> None:
 
     df = st.session_state.get("df")
     if df is None:
-        from data.schedule_repo import load_schedule
-        df = load_schedule()
+        df = get_prepared_schedule()
         st.session_state.df = df
 
-    df = ensure_schedule_columns(df)
-    df = ensure_row_ids(df)
-    df = add_computed_columns(df)
-    st.session_state.df = df
-
-    # Filter to today's appointments only
-    from datetime import datetime
-    from config.settings import IST
-    today_str = datetime.now(IST).strftime("%Y-%m-%d")
-    date_col = "DATE" if "DATE" in df.columns else "appointment_date"
-    if date_col in df.columns:
-        df = df[df[date_col].astype(str).str.startswith(today_str)]
+    st.session_state.df = prepare_schedule(df)
 
     col_window, col_refresh = st.columns([4, 1])
     with col_window:
@@ -47,10 +37,20 @@ def render() -> None:
     with col_refresh:
         if st.button("🔄", width='stretch', key="upcoming_refresh"):
             st.session_state.df = None
-            st.cache_data.clear()
+            clear_schedule_cache()
             st.rerun()
 
-    upcoming = filter_upcoming(df, minutes_ahead=window)
+    _render_card_list(window)
+
+
+@st.fragment
+def _render_card_list(window: int) -> None:
+    """Card list; status/delete clicks rerun only this fragment."""
+    now = now_ist()
+    df = prepare_schedule(st.session_state.df, now)
+    st.session_state.df = df
+
+    upcoming = filter_upcoming(df, minutes_ahead=window, now=now)
 
     if upcoming.empty:
         st.info(f"✅ No upcoming appointments in the next {window} minutes.")
@@ -74,13 +74,11 @@ def _on_status_change(df, row_id: str, new_status: str) -> None:
     updated = update_status(df, row_id, new_status)
     st.session_state.df = updated
     maybe_save(updated, message=f"Status → {new_status}")
-    st.rerun()
+    st.rerun(scope="fragment")
 
 
 def _on_delete(df, row_id: str) -> None:
-    mask = df["REMINDER_ROW_ID"].astype(str).str.strip() == row_id
-    updated = df[~mask].reset_index(drop=True)
-    updated.attrs = df.attrs.copy()
+    updated = delete_row(df, row_id)
     st.session_state.df = updated
     maybe_save(updated, message="Row deleted")
-    st.rerun()
+    st.rerun(scope="fragment")
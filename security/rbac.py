@@ -35,8 +35,12 @@ ACTION_FUNCTIONS: list[tuple[str, str]] = [
 ]
 
 
-def get_function_catalog() -> list[dict]:
-    """Build dynamic function catalog from current app navigation + action registry."""
+# ((id(NAV_STRUCTURE), id(ACTION_FUNCTIONS)), catalog, catalog ids); rebuilt only
+# when either registry object is replaced.
+_CATALOG_CACHE: tuple[tuple[int, int], list[dict], frozenset[str]] | None = None
+
+
+def _build_function_catalog() -> list[dict]:
     items: list[dict] = []
     seen: set[str] = set()
 
@@ -66,20 +70,62 @@ def get_function_catalog() -> list[dict]:
     return items
 
 
-def get_all_function_ids() -> set[str]:
-    return {x["id"] for x in get_function_catalog()}
+def _function_catalog_cached() -> tuple[tuple[int, int], list[dict], frozenset[str]]:
+    global _CATALOG_CACHE
+    key = (id(NAV_STRUCTURE), id(ACTION_FUNCTIONS))
+    if _CATALOG_CACHE is None or _CATALOG_CACHE[0] != key:
+        items = _build_function_catalog()
+        _CATALOG_CACHE = (key, items, frozenset(x["id"] for x in items))
+    return _CATALOG_CACHE
+
+
+def get_function_catalog() -> list[dict]:
+    """Dynamic function catalog from current app navigation + action registry (shared; do not mutate)."""
+    return _function_catalog_cached()[1]
+
+
+def get_all_function_ids() -> frozenset[str]:
+    return _function_catalog_cached()[2]
 
 
 def _normalize_allowed(values: Iterable[str]) -> list[str]:
     known = get_all_function_ids()
     out: list[str] = []
+    seen: set[str] = set()
+    # Keep insertion order but remove duplicates; known ids skip the str()/strip() work.
     for val in values:
-        item = str(val or "").strip()
-        if item and item in known:
+        item = val if isinstance(val, str) and val in known else str(val or "").strip()
+        if item in known and item not in seen:
+            seen.add(item)
             out.append(item)
-    # Keep insertion order but remove duplicates.
-    dedup = list(dict.fromkeys(out))
-    return dedup
+    return out
+
+
+_ASSISTANT_EXTRA = frozenset(
+    {
+        "action::operations::punch",
+        "action::operations::duties",
+        "action::operations::reminders",
+        "action::schedule::update_status",
+    }
+)
+_FRONTDESK_EXTRA = frozenset(
+    {
+        "action::operations::punch",
+        "action::operations::duties",
+        "action::operations::reminders",
+        "action::schedule::add_appointment",
+        "action::schedule::edit_appointment",
+        "action::schedule::delete_appointment",
+        "action::schedule::update_status",
+    }
+)
+
+# (permission frozenset, {category: views}) for the last set get_allowed_navigation saw.
+_PAGE_INDEX_CACHE: tuple[frozenset[str], dict[str, frozenset[str]]] | None = None
+
+# (id(ROLE_NAV), {role: page ids}); rebuilt only when ROLE_NAV is replaced.
+_ROLE_PAGE_IDS_CACHE: tuple[int, dict[str, frozenset[str]]] | None = None
 
 
 def _page_ids_from_role_nav(role_nav: dict[str, list[str]]) -> set[str]:
@@ -90,36 +136,28 @@ def _page_ids_from_role_nav(role_nav: dict[str, list[str]]) -> set[str]:
     return page_ids
 
 
+def _role_page_ids(role_norm: str) -> frozenset[str]:
+    global _ROLE_PAGE_IDS_CACHE
+    if _ROLE_PAGE_IDS_CACHE is None or _ROLE_PAGE_IDS_CACHE[0] != id(ROLE_NAV):
+        _ROLE_PAGE_IDS_CACHE = (id(ROLE_NAV), {})
+    cache = _ROLE_PAGE_IDS_CACHE[1]
+    if role_norm not in cache:
+        cache[role_norm] = frozenset(_page_ids_from_role_nav(ROLE_NAV.get(role_norm, {})))
+    return cache[role_norm]
+
+
 def get_default_role_permissions(role: str) -> set[str]:
     """Role defaults. Admin always gets all functions."""
     role_norm = str(role or "").strip().lower()
     if role_norm == "admin":
-        return get_all_function_ids()
+        return set(get_all_function_ids())
 
-    base_nav = ROLE_NAV.get(role_norm, {})
-    allowed = _page_ids_from_role_nav(base_nav)
+    allowed = set(_role_page_ids(role_norm))
 
     if role_norm == "assistant":
-        allowed.update(
-            {
-                "action::operations::punch",
-                "action::operations::duties",
-                "action::operations::reminders",
-                "action::schedule::update_status",
-            }
-        )
+        allowed |= _ASSISTANT_EXTRA
     elif role_norm == "frontdesk":
-        allowed.update(
-            {
-                "action::operations::punch",
-                "action::operations::duties",
-                "action::operations::reminders",
-                "action::schedule::add_appointment",
-                "action::schedule::edit_appointment",
-                "action::schedule::delete_appointment",
-                "action::schedule::update_status",
-            }
-        )
+        allowed |= _FRONTDESK_EXTRA
 
     return allowed
 
@@ -159,11 +197,15 @@ def get_permissions_config_error() -> str:
     return get_last_rbac_error()
 
 
+def _session_marker(role: str, user_id: str | None) -> str:
+    return f"{str(role or '').strip().lower()}:{str(user_id or '').strip()}"
+
+
 def resolve_effective_permissions(role: str, user_id: str | None = None) -> set[str]:
     """Resolve role + optional user override into effective permissions."""
     role_norm = str(role or "").strip().lower()
     if role_norm == "admin":
-        return get_all_function_ids()
+        return set(get_all_function_ids())
 
     role_allowed = set(get_role_permissions_config(role_norm))
     if not user_id:
@@ -175,10 +217,20 @@ def resolve_effective_permissions(role: str, user_id: str | None = None) -> set[
     return role_allowed
 
 
-def load_permissions_for_session(role: str, user_id: str | None = None) -> set[str]:
+def load_permissions_for_session(role: str, user_id: str | None = None, refresh: bool = True) -> set[str]:
+    """Store effective permissions in the session.
+
+    With ``refresh=False`` the session's permissions are reused, without a
+    storage read, when they were already loaded for this role/user.
+    """
+    marker = _session_marker(role, user_id)
+    cached = st.session_state.get("allowed_functions_set")
+    if not refresh and cached is not None and st.session_state.get("permissions_loaded_for") == marker:
+        return set(cached)
+
     perms = resolve_effective_permissions(role, user_id)
-    marker = f"{str(role or '').strip().lower()}:{str(user_id or '').strip()}"
     st.session_state.allowed_functions = sorted(perms)
+    st.session_state.allowed_functions_set = frozenset(perms)
     st.session_state.permissions_loaded_for = marker
     return perms
 
@@ -193,7 +245,9 @@ def has_access(function_id: str, allowed_functions: Iterable[str] | None = None)
         return True
 
     if allowed_functions is None:
-        allowed = set(str(x).strip() for x in st.session_state.get("allowed_functions", []) if str(x).strip())
+        allowed = st.session_state.get("allowed_functions_set")
+        if allowed is None:
+            allowed = set(str(x).strip() for x in st.session_state.get("allowed_functions", []) if str(x).strip())
     else:
         allowed = set(str(x).strip() for x in allowed_functions if str(x).strip())
     return fid in allowed
@@ -207,14 +261,42 @@ def require_access(function_id: str, feature_name: str = "this feature") -> bool
     return False
 
 
+def _page_index(allowed: frozenset[str]) -> dict[str, frozenset[str]]:
+    """Split ``page::<category>::<view>`` ids into {category: views}, once per permission set."""
+    global _PAGE_INDEX_CACHE
+    if _PAGE_INDEX_CACHE is not None and _PAGE_INDEX_CACHE[0] is allowed:
+        return _PAGE_INDEX_CACHE[1]
+    grouped: dict[str, set[str]] = {}
+    for fid in allowed:
+        parts = fid.split("::", 2)
+        if len(parts) == 3 and parts[0] == "page":
+            grouped.setdefault(parts[1], set()).add(parts[2])
+    index = {category: frozenset(views) for category, views in grouped.items()}
+    _PAGE_INDEX_CACHE = (allowed, index)
+    return index
+
+
 def get_allowed_navigation(role: str, allowed_functions: Iterable[str] | None = None) -> dict[str, list[str]]:
     role_norm = str(role or "").strip().lower()
     if role_norm == "admin":
         return {k: list(v) for k, v in NAV_STRUCTURE.items()}
 
+    if allowed_functions is None:
+        allowed = st.session_state.get("allowed_functions_set")
+        if allowed is None:
+            allowed = frozenset(str(x).strip() for x in st.session_state.get("allowed_functions", []))
+    elif isinstance(allowed_functions, frozenset):
+        allowed = allowed_functions
+    else:
+        allowed = frozenset(str(x).strip() for x in allowed_functions)
+    page_index = _page_index(allowed)
+
     nav: dict[str, list[str]] = {}
     for category, views in NAV_STRUCTURE.items():
-        allowed_views = [view for view in views if has_access(function_id_for_page(category, view), allowed_functions)]
+        allowed_in_category = page_index.get(str(category).strip())
+        if not allowed_in_category:
+            continue
+        allowed_views = [view for view in views if str(view).strip() in allowed_in_category]
         if allowed_views:
             nav[category] = allowed_views
     return nav
@@ -2,33 +2,43 @@
 """Auto-allocation engine: assigns assistants to appointment slots."""
 
 from __future__ import annotations
-import json
-from pathlib import Path
-from typing import Any, Optional
+from typing import Any, NamedTuple, Optional
+import numpy as np
 import pandas as pd
 
-from services.utils import coerce_to_time_obj, is_blank, norm_name
-from services.availability import is_assistant_available, get_assistant_schedule
-from services.schedule_ops import get_assistant_loads
+from services.utils import coerce_to_time_obj, is_blank, norm_name, load_alloc_config
+from services.availability import (
+    is_assistant_available, punch_block_reason, index_time_blocks,
+    build_assistant_schedule_index, update_assistant_schedule_index,
+)
+from services.schedule_ops import get_assistant_loads, forget_upper_columns
+from config.constants import TERMINAL_STATUS_RE
 from services.profiles_cache import (
     get_profiles_cache, get_assistants_for_department,
     get_department_for_doctor, get_all_assistants,
 )
 
 
-def _load_alloc_config() -> dict[str, Any]:
-    try:
-        path = Path(__file__).parent.parent / "allocation_rules.json"
-        if path.exists():
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data if isinstance(data, dict) else {}
-    except Exception:
-        pass
-    return {}
+# (config, derived per-config lookups) for the last allocation_rules.json seen.
+_DERIVED_CACHE: tuple[dict, dict[tuple[str, str], dict]] | None = None
+
+
+def _derived_cfg(config: dict, key: tuple[str, str], build) -> dict:
+    """Memoize ``build(config)`` for as long as the same config object is passed in."""
+    global _DERIVED_CACHE
+    if _DERIVED_CACHE is None or config is not _DERIVED_CACHE[0]:
+        _DERIVED_CACHE = (config, {})
+    derived = _DERIVED_CACHE[1]
+    if key not in derived:
+        derived[key] = build(config)
+    return derived[key]
 
 
 def _get_global_cfg(config: dict) -> dict:
+    return _derived_cfg(config, ("global", ""), _build_global_cfg)
+
+
+def _build_global_cfg(config: dict) -> dict:
     g = config.get("global", {}) if isinstance(config, dict) else {}
     if not isinstance(g, dict):
         g = {}
@@ -43,70 +53,141 @@ def _get_global_cfg(config: dict) -> dict:
     }
 
 
-def _get_dept_cfg(department: str, config: dict) -> dict:
+def _dept_cfg_map(config: dict) -> dict:
     depts = config.get("departments", {}) if isinstance(config, dict) else {}
+    out: dict[str, dict] = {}
     if isinstance(depts, dict):
         for key, val in depts.items():
-            if str(key).strip().upper() == department.strip().upper():
-                return val if isinstance(val, dict) else {}
-    return {}
+            out.setdefault(str(key).strip().upper(), val if isinstance(val, dict) else {})
+    return out
 
 
-def _get_free_set(df_schedule: pd.DataFrame, all_assistants: list[str]) -> set[str]:
-    """Get set of assistants not currently in an active appointment."""
-    from services.utils import now_ist
-    now = now_ist()
-    current_min = now.hour * 60 + now.minute
-    free_set: set[str] = set()
-    for assistant in all_assistants:
-        a_upper = str(assistant).strip().upper()
-        schedule = get_assistant_schedule(a_upper, df_schedule)
-        busy = False
-        for appt in schedule:
-            s = str(appt.get("status", "")).upper()
-            if "ON GOING" in s or "ONGOING" in s:
-                busy = True; break
-            appt_in = coerce_to_time_obj(appt.get("in_time"))
-            appt_out = coerce_to_time_obj(appt.get("out_time"))
-            if appt_in and appt_out:
-                in_m = appt_in.hour * 60 + appt_in.minute
-                out_m = appt_out.hour * 60 + appt_out.minute
-                if in_m <= current_min <= out_m:
-                    busy = True; break
-        if not busy:
-            free_set.add(a_upper)
-    return free_set
-
-
-def _rule_candidates(role: str, rule: dict, doctor: str, appt_hour: float, first_assigned: str) -> list[str]:
+def _get_dept_cfg(department: str, config: dict) -> dict:
+    return _derived_cfg(config, ("departments", ""), _dept_cfg_map).get(department.strip().upper(), {})
+
+
+class _CompiledRule(NamedTuple):
+    """One role's allocation rule with every name list pre-normalized to upper case."""
+    time_override: tuple[tuple[float, float, list[str]], ...]
+    when_doctor_is: dict[str, list[str]]
+    when_first_is: dict[str, list[str]]
+    default: list[str]
+
+
+_EMPTY_RULE = _CompiledRule((), {}, {}, [])
+
+
+def _upper_names(names) -> list[str]:
+    return [str(n).strip().upper() for n in names if str(n).strip()]
+
+
+def _compile_keyed_names(mapping) -> dict[str, list[str]]:
+    # First key (after normalizing) with a non-empty list wins, as in a linear scan.
+    out: dict[str, list[str]] = {}
+    for key, names in (mapping.items() if isinstance(mapping, dict) else ()):
+        if names:
+            out.setdefault(str(key).strip().upper(), _upper_names(names))
+    return out
+
+
+def _compile_rule(rule: Any) -> _CompiledRule:
     if not isinstance(rule, dict):
-        return []
-    # Time overrides
+        return _EMPTY_RULE
+    overrides = []
     for override in (rule.get("time_override", []) or []):
         if not isinstance(override, dict):
             continue
         try:
             start = float(override.get("start_hour", 0))
             end = float(override.get("end_hour", 24))
-            if start <= appt_hour < end:
-                names = override.get("names", []) or []
-                if names:
-                    return [str(n).strip().upper() for n in names if str(n).strip()]
         except Exception:
-            pass
+            continue
+        names = override.get("names", []) or []
+        if names:
+            overrides.append((start, end, _upper_names(names)))
+    return _CompiledRule(
+        time_override=tuple(overrides),
+        when_doctor_is=_compile_keyed_names(rule.get("when_doctor_is", {}) or {}),
+        when_first_is=_compile_keyed_names(rule.get("when_first_is", {}) or {}),
+        default=_upper_names(rule.get("default", []) or []),
+    )
+
+
+def _get_dept_rules(department: str, config: dict) -> dict[str, _CompiledRule]:
+    """Compiled FIRST/SECOND/Third rules for a department, built once per config load."""
+    def build(cfg: dict) -> dict[str, _CompiledRule]:
+        dept_cfg = _get_dept_cfg(department, cfg)
+        rules = dept_cfg.get("allocation_rules", {}) if isinstance(dept_cfg, dict) else {}
+        if not isinstance(rules, dict):
+            return {}
+        return {role: _compile_rule(rule) for role, rule in rules.items()}
+    return _derived_cfg(config, ("rules", department.strip().upper()), build)
+
+
+def _minute_of_day(value: Any) -> int:
+    t = coerce_to_time_obj(value)
+    return t.hour * 60 + t.minute if t is not None else -1
+
+
+def _slot_minutes(df_schedule: pd.DataFrame) -> tuple[np.ndarray, np.ndarray]:
+    """In/Out Time as minute-of-day int64 arrays (-1 where unparseable)."""
+    def minutes(col: str) -> np.ndarray:
+        if col not in df_schedule.columns:
+            return np.full(len(df_schedule), -1, dtype="int64")
+        return df_schedule[col].map(_minute_of_day).to_numpy(dtype="int64")
+    return minutes("In Time"), minutes("Out Time")
+
+
+def _get_free_set(
+    df_schedule: pd.DataFrame,
+    all_assistants: list[str],
+    slot_minutes: Optional[tuple[np.ndarray, np.ndarray]] = None,
+) -> set[str]:
+    """Get set of assistants not currently in an active appointment.
+
+    ``slot_minutes`` is ``_slot_minutes(df_schedule)``, passed in by callers
+    that check many slots against the same schedule.
+    """
+    from services.utils import now_ist
+    now = now_ist()
+    current_min = now.hour * 60 + now.minute
+    all_upper = {str(a).strip().upper() for a in all_assistants}
+    roles = [c for c in ("FIRST", "SECOND", "Third") if c in df_schedule.columns]
+    if df_schedule.empty or not roles:
+        return all_upper
+
+    status_u = (
+        df_schedule["STATUS"].astype(str).str.strip().str.upper()
+        if "STATUS" in df_schedule.columns
+        else pd.Series("", index=df_schedule.index)
+    )
+    active = ~status_u.str.contains(TERMINAL_STATUS_RE, regex=True).to_numpy(dtype=bool)
+    ongoing = status_u.str.contains("ON GOING|ONGOING", regex=True).to_numpy(dtype=bool)
+    in_m, out_m = slot_minutes if slot_minutes is not None else _slot_minutes(df_schedule)
+    in_window = (in_m >= 0) & (out_m >= 0) & (in_m <= current_min) & (current_min <= out_m)
+    busy_mask = active & (ongoing | in_window)
+    if not busy_mask.any():
+        return all_upper
+
+    busy_set = set(df_schedule.loc[busy_mask, roles].astype(str).stack().str.strip().str.upper())
+    return all_upper - busy_set
+
+
+def _rule_candidates(role: str, rule: _CompiledRule, doctor: str, appt_hour: float, first_assigned: str) -> list[str]:
+    # Time overrides
+    for start, end, names in rule.time_override:
+        if start <= appt_hour < end:
+            return names
     # Doctor-specific
-    for doc_key, names in (rule.get("when_doctor_is", {}) or {}).items():
-        if str(doc_key).strip().upper() == norm_name(doctor):
-            if names:
-                return [str(n).strip().upper() for n in names if str(n).strip()]
+    names = rule.when_doctor_is.get(norm_name(doctor))
+    if names is not None:
+        return names
     # When-first-is (for SECOND)
-    for first_key, names in (rule.get("when_first_is", {}) or {}).items():
-        if str(first_key).strip().upper() == str(first_assigned).strip().upper():
-            if names:
-                return [str(n).strip().upper() for n in names if str(n).strip()]
+    names = rule.when_first_is.get(str(first_assigned).strip().upper())
+    if names is not None:
+        return names
     # Default
-    defaults = rule.get("default", []) or []
-    return [str(n).strip().upper() for n in defaults if str(n).strip()]
+    return rule.default
 
 
 def _select_candidate(
@@ -141,8 +222,10 @@ def allocate_for_slot(
     current_assignments: Optional[dict] = None,
     only_fill_empty: bool = False,
     punch_map: Optional[dict] = None,
-    time_blocks: Optional[list] = None,
+    time_blocks: Optional[list | dict] = None,
     today_str: Optional[str] = None,
+    schedule_index: Optional[dict] = None,
+    slot_minutes: Optional[tuple[np.ndarray, np.ndarray]] = None,
 ) -> dict[str, str]:
     result = {"FIRST": "", "SECOND": "", "Third": ""}
     if current_assignments:
@@ -158,24 +241,29 @@ def allocate_for_slot(
         return result
 
     appt_hour = in_obj.hour + in_obj.minute / 60.0
-    config = _load_alloc_config()
+    config = load_alloc_config()
     global_cfg = _get_global_cfg(config)
-    dept_cfg = _get_dept_cfg(department, config)
-    rules = dept_cfg.get("allocation_rules", {}) if isinstance(dept_cfg, dict) else {}
+    rules = _get_dept_rules(department, config)
 
     all_assistants = get_all_assistants()
     dept_assistants = get_assistants_for_department(department)
-    free_set = _get_free_set(df_schedule, all_assistants)
+    if schedule_index is None:
+        schedule_index = build_assistant_schedule_index(df_schedule)
+    if time_blocks and today_str and not isinstance(time_blocks, dict):
+        time_blocks = index_time_blocks(time_blocks, today_str)
+    free_set = _get_free_set(df_schedule, all_assistants, slot_minutes)
 
     def get_available(asst_list: list[str]) -> tuple[list[str], dict[str, str]]:
         order, amap = [], {}
         for a in asst_list:
             a_upper = str(a).strip().upper()
-            if a_upper not in free_set:
+            # Off-duty assistants are dropped before any schedule/time-block checks.
+            if a_upper not in free_set or punch_block_reason(a_upper, punch_map):
                 continue
             avail, _ = is_assistant_available(
                 a, in_time, out_time, df_schedule, exclude_row_id,
-                punch_map=punch_map, time_blocks=time_blocks, today_str=today_str,
+                time_blocks=time_blocks, today_str=today_str,
+                schedule_index=schedule_index,
             )
             if avail:
                 order.append(a_upper)
@@ -194,7 +282,7 @@ def allocate_for_slot(
     for role in ["FIRST", "SECOND", "Third"]:
         if only_fill_empty and result.get(role):
             continue
-        rule = rules.get(role, {}) if isinstance(rules, dict) else {}
+        rule = rules.get(role, _EMPTY_RULE)
         candidates = _rule_candidates(role, rule, doctor, appt_hour, result.get("FIRST", ""))
         chosen = _select_candidate(candidates, dept_map, dept_order, already, global_cfg["load_balance"], load_map)
         if not chosen and global_cfg["cross_department_fallback"]:
@@ -213,16 +301,29 @@ def auto_allocate_all(
     time_blocks: Optional[list] = None,
     today_str: Optional[str] = None,
 ) -> tuple[pd.DataFrame, int]:
-    df = df_schedule.copy()
+    # Shallow copy: only FIRST/SECOND/Third are written below, so only they get fresh arrays.
+    df = df_schedule.copy(deep=False)
     changed = 0
-    for idx in range(len(df)):
-        row = df.iloc[idx]
+    role_pos = {}
+    for c in ("FIRST", "SECOND", "Third"):
+        if c in df.columns:
+            df[c] = df_schedule[c].copy()
+            role_pos[c] = df.columns.get_loc(c)
+    forget_upper_columns(df, role_pos)
+    # Built once; rows are re-filed below as allocations change them.
+    schedule_index = build_assistant_schedule_index(df)
+    if time_blocks and today_str:
+        time_blocks = index_time_blocks(time_blocks, today_str)
+    # Only the assignment columns change below, so slot times are parsed once per pass.
+    slot_minutes = _slot_minutes(df)
+    in_m, out_m = slot_minutes
+    for idx, row in enumerate(df.to_dict("records")):
         doctor = str(row.get("DR.", "") or row.get("Doctor", "")).strip()
         if not doctor:
             continue
         in_time = row.get("In Time")
         out_time = row.get("Out Time")
-        if coerce_to_time_obj(in_time) is None or coerce_to_time_obj(out_time) is None:
+        if in_m[idx] < 0 or out_m[idx] < 0:
             continue
         row_id = str(row.get("REMINDER_ROW_ID", "")).strip()
         department = get_department_for_doctor(doctor)
@@ -234,13 +335,21 @@ def auto_allocate_all(
             exclude_row_id=row_id, current_assignments=current,
             only_fill_empty=only_fill_empty,
             punch_map=punch_map, time_blocks=time_blocks, today_str=today_str,
+            schedule_index=schedule_index, slot_minutes=slot_minutes,
         )
+        row_changed = False
         for role in ["FIRST", "SECOND", "Third"]:
             new_val = allocations.get(role, "")
             old_val = current.get(role, "")
             if is_blank(new_val):
                 continue
-            if str(new_val).strip() != str(old_val).strip() and role in df.columns:
-                df.iloc[idx, df.columns.get_loc(role)] = new_val
+            if str(new_val).strip() != str(old_val).strip() and role in role_pos:
+                df.iat[idx, role_pos[role]] = new_val
+                # Later slots read loads through upper_column; drop its now-stale copy.
+                forget_upper_columns(df, (role,))
+                row[role] = new_val
                 changed += 1
+                row_changed = True
+        if row_changed:
+            update_assistant_schedule_index(schedule_index, {**row, **current}, row)
     return df, changed
@@ -8,85 +8,202 @@ import json
 import pandas as pd
 
 from services.utils import coerce_to_time_obj, time_to_minutes, now_ist, is_blank, time_to_hhmm
-from config.constants import TERMINAL_STATUSES
+from config.constants import TERMINAL_STATUS_RE
 
 
-def get_assistant_schedule(assistant_name: str, df_schedule: pd.DataFrame) -> list[dict[str, Any]]:
-    """Get all active appointments where this assistant is assigned."""
-    if not assistant_name or df_schedule is None or df_schedule.empty:
+_ASSIGNMENT_COLUMNS = ("FIRST", "SECOND", "Third")
+_UPPER_COLUMNS = ("STATUS", *_ASSIGNMENT_COLUMNS)
+_SCHEDULE_INDEX_COLUMNS = (
+    *_ASSIGNMENT_COLUMNS, "STATUS", "In Time", "Out Time", "Patient Name", "DR.", "OP", "REMINDER_ROW_ID",
+)
+
+
+def _upper_values(record: dict[str, Any]) -> dict[str, str]:
+    return {c: str(record.get(c, "")).strip().upper() for c in _UPPER_COLUMNS if c in record}
+
+
+def _appointment_entries(
+    record: dict[str, Any],
+    upper: Optional[dict[str, str]] = None,
+) -> list[tuple[str, dict[str, Any]]]:
+    """(assistant upper, appointment) pairs for one schedule row; none for terminal statuses.
+
+    ``upper`` holds the row's stripped, upper-cased STATUS/FIRST/SECOND/Third
+    when the caller already normalized them column-wise.
+    """
+    if upper is None:
+        upper = _upper_values(record)
+    status = upper.get("STATUS", "")
+    if TERMINAL_STATUS_RE.search(status):
+        return []
+    # Minute bounds are parsed once per row; out_min is wrapped past midnight when needed.
+    in_obj = coerce_to_time_obj(record.get("In Time"))
+    out_obj = coerce_to_time_obj(record.get("Out Time"))
+    in_min = in_obj.hour * 60 + in_obj.minute if in_obj is not None else None
+    out_min = out_obj.hour * 60 + out_obj.minute if out_obj is not None else None
+    if in_min is not None and out_min is not None and out_min < in_min:
+        out_min += 1440
+    entries = []
+    seen: set[str] = set()
+    for col in _ASSIGNMENT_COLUMNS:
+        if col not in upper:
+            continue
+        val = upper[col]
+        if not val or val in seen:
+            continue
+        seen.add(val)
+        entries.append((val, {
+            "row_id": record.get("REMINDER_ROW_ID", ""),
+            "patient": record.get("Patient Name", "Unknown"),
+            "in_time": record.get("In Time"),
+            "out_time": record.get("Out Time"),
+            "in_min": in_min,
+            "out_min": out_min,
+            "doctor": record.get("DR.", ""),
+            "op": record.get("OP", ""),
+            "role": col,
+            "status": status,
+        }))
+    return entries
+
+
+def _hhmm(minutes: int) -> str:
+    minutes %= 1440
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+
+def build_assistant_schedule_index(df_schedule: pd.DataFrame) -> dict[str, list[dict[str, Any]]]:
+    """Map assistant (upper) -> active appointments, built in one pass over the schedule."""
+    index: dict[str, list[dict[str, Any]]] = {}
+    if df_schedule is None or df_schedule.empty:
+        return index
+    frame = df_schedule[[c for c in _SCHEDULE_INDEX_COLUMNS if c in df_schedule.columns]]
+    # Normalize name/status columns once per column rather than once per row and lookup.
+    upper_cols = {
+        c: frame[c].astype(str).str.strip().str.upper().tolist()
+        for c in _UPPER_COLUMNS
+        if c in frame.columns
+    }
+    for i, record in enumerate(frame.to_dict("records")):
+        upper = {c: values[i] for c, values in upper_cols.items()}
+        for assist_upper, appt in _appointment_entries(record, upper):
+            index.setdefault(assist_upper, []).append(appt)
+    return index
+
+
+def update_assistant_schedule_index(
+    index: dict[str, list[dict[str, Any]]],
+    old_record: dict[str, Any],
+    new_record: dict[str, Any],
+) -> None:
+    """Re-file one row in ``index`` after its assignments changed."""
+    for assist_upper, appt in _appointment_entries(old_record):
+        appts = index.get(assist_upper, [])
+        for i, existing in enumerate(appts):
+            if existing == appt:
+                del appts[i]
+                break
+    for assist_upper, appt in _appointment_entries(new_record):
+        index.setdefault(assist_upper, []).append(appt)
+
+
+def get_assistant_schedule(
+    assistant_name: str,
+    df_schedule: pd.DataFrame | dict[str, list[dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """Get all active appointments where this assistant is assigned.
+
+    ``df_schedule`` may also be an index from build_assistant_schedule_index.
+    """
+    if not assistant_name or df_schedule is None:
         return []
     assist_upper = str(assistant_name).strip().upper()
-    appointments = []
-    for _, row in df_schedule.iterrows():
-        for col in ["FIRST", "SECOND", "Third"]:
-            if col in row.index:
-                val = str(row.get(col, "")).strip().upper()
-                if val == assist_upper:
-                    status = str(row.get("STATUS", "")).strip().upper()
-                    if any(s in status for s in TERMINAL_STATUSES):
-                        continue
-                    appointments.append({
-                        "row_id": row.get("REMINDER_ROW_ID", ""),
-                        "patient": row.get("Patient Name", "Unknown"),
-                        "in_time": row.get("In Time"),
-                        "out_time": row.get("Out Time"),
-                        "doctor": row.get("DR.", ""),
-                        "op": row.get("OP", ""),
-                        "role": col,
-                        "status": status,
-                    })
-                    break
-    return appointments
+    if isinstance(df_schedule, dict):
+        return list(df_schedule.get(assist_upper, []))
+    if df_schedule.empty:
+        return []
+    return build_assistant_schedule_index(df_schedule).get(assist_upper, [])
 
 
-def is_blocked_by_time_block(
-    assistant_upper: str,
-    check_in_min: int,
-    check_out_min: int,
-    time_blocks: list[dict],
-    today_str: str,
-) -> tuple[bool, str]:
-    for block in time_blocks:
+def index_time_blocks(time_blocks: list[dict], today_str: str) -> dict[str, list[tuple[int, int, Any]]]:
+    """Map assistant (upper) -> [(start_min, end_min, reason)] for today's blocks."""
+    index: dict[str, list[tuple[int, int, Any]]] = {}
+    for block in time_blocks or []:
         if str(block.get("date", "")).strip() != today_str:
             continue
-        if str(block.get("assistant", "")).strip().upper() != assistant_upper:
-            continue
         start_t = coerce_to_time_obj(block.get("start_time"))
         end_t = coerce_to_time_obj(block.get("end_time"))
         if start_t is None or end_t is None:
             continue
-        start_min = start_t.hour * 60 + start_t.minute
-        end_min = end_t.hour * 60 + end_t.minute
+        assistant_upper = str(block.get("assistant", "")).strip().upper()
+        index.setdefault(assistant_upper, []).append((
+            start_t.hour * 60 + start_t.minute,
+            end_t.hour * 60 + end_t.minute,
+            block.get("reason", "Blocked"),
+        ))
+    return index
+
+
+def _assistant_blocks(
+    assistant_upper: str,
+    time_blocks: list[dict] | dict[str, list[tuple[int, int, Any]]],
+    today_str: str,
+) -> list[tuple[int, int, Any]]:
+    if isinstance(time_blocks, dict):
+        return time_blocks.get(assistant_upper, [])
+    return index_time_blocks(time_blocks, today_str).get(assistant_upper, [])
+
+
+def is_blocked_by_time_block(
+    assistant_upper: str,
+    check_in_min: int,
+    check_out_min: int,
+    time_blocks: list[dict] | dict[str, list[tuple[int, int, Any]]],
+    today_str: str,
+) -> tuple[bool, str]:
+    """``time_blocks`` may be the raw list or an index_time_blocks() result for ``today_str``."""
+    for start_min, end_min, reason in _assistant_blocks(assistant_upper, time_blocks, today_str):
         if end_min < start_min:
             end_min += 1440
         if not (check_out_min <= start_min or check_in_min >= end_min):
-            return True, f"Blocked: {block.get('reason', 'Blocked')}"
+            return True, f"Blocked: {reason}"
     return False, ""
 
 
 def is_blocked_by_time_block_point(
     assistant_upper: str,
     check_time: time_type,
-    time_blocks: list[dict],
+    time_blocks: list[dict] | dict[str, list[tuple[int, int, Any]]],
     today_str: str,
 ) -> tuple[bool, str]:
+    """``time_blocks`` may be the raw list or an index_time_blocks() result for ``today_str``."""
     check_min = check_time.hour * 60 + check_time.minute
-    for block in time_blocks:
-        if str(block.get("date", "")).strip() != today_str:
-            continue
-        if str(block.get("assistant", "")).strip().upper() != assistant_upper:
-            continue
-        start_t = coerce_to_time_obj(block.get("start_time"))
-        end_t = coerce_to_time_obj(block.get("end_time"))
-        if start_t is None or end_t is None:
-            continue
-        start_min = start_t.hour * 60 + start_t.minute
-        end_min = end_t.hour * 60 + end_t.minute
+    for start_min, end_min, reason in _assistant_blocks(assistant_upper, time_blocks, today_str):
         if start_min <= check_min <= end_min:
-            return True, block.get("reason", "Blocked")
+            return True, reason
     return False, ""
 
 
+def punch_block_reason(
+    assist_upper: str,
+    punch_map: Optional[dict],
+    weekly_off_set: Optional[set] = None,
+) -> str:
+    """Why the punch state rules this assistant out ("" when on duty or no punch map)."""
+    if punch_map is None:
+        return ""
+    pdata = punch_map.get(assist_upper, {})
+    punch_in = pdata.get("punch_in", "")
+    punch_out = pdata.get("punch_out", "")
+    if not punch_in:
+        if weekly_off_set and assist_upper in weekly_off_set:
+            return f"Weekly off ({now_ist().strftime('%A')})"
+        return "Not punched in"
+    if punch_out:
+        return f"Punched out at {punch_out[:5]}"
+    return ""
+
+
 def is_assistant_available(
     assistant_name: str,
     check_in_time: Any,
@@ -94,25 +211,19 @@ def is_assistant_available(
     df_schedule: pd.DataFrame,
     exclude_row_id: Optional[str] = None,
     punch_map: Optional[dict] = None,
-    time_blocks: Optional[list] = None,
+    time_blocks: Optional[list | dict] = None,
     weekly_off_set: Optional[set] = None,
     today_str: Optional[str] = None,
+    schedule_index: Optional[dict] = None,
 ) -> tuple[bool, str]:
     if not assistant_name:
         return False, "No assistant specified"
     assist_upper = str(assistant_name).strip().upper()
 
     # Punch check
-    if punch_map is not None:
-        pdata = punch_map.get(assist_upper, {})
-        punch_in = pdata.get("punch_in", "")
-        punch_out = pdata.get("punch_out", "")
-        if not punch_in:
-            if weekly_off_set and assist_upper in weekly_off_set:
-                return False, f"Weekly off ({now_ist().strftime('%A')})"
-            return False, "Not punched in"
-        if punch_out:
-            return False, f"Punched out at {punch_out[:5]}"
+    punch_reason = punch_block_reason(assist_upper, punch_map, weekly_off_set)
+    if punch_reason:
+        return False, punch_reason
 
     in_obj = coerce_to_time_obj(check_in_time)
     out_obj = coerce_to_time_obj(check_out_time)
@@ -129,44 +240,34 @@ def is_assistant_available(
         if blocked:
             return False, reason
 
-    schedule = get_assistant_schedule(assist_upper, df_schedule)
+    schedule = get_assistant_schedule(assist_upper, schedule_index if schedule_index is not None else df_schedule)
     for appt in schedule:
         if exclude_row_id and str(appt.get("row_id", "")).strip() == str(exclude_row_id).strip():
             continue
-        appt_in = coerce_to_time_obj(appt.get("in_time"))
-        appt_out = coerce_to_time_obj(appt.get("out_time"))
-        if appt_in is None or appt_out is None:
+        appt_in_min = appt.get("in_min")
+        appt_out_min = appt.get("out_min")
+        if appt_in_min is None or appt_out_min is None:
             continue
-        appt_in_min = appt_in.hour * 60 + appt_in.minute
-        appt_out_min = appt_out.hour * 60 + appt_out.minute
-        if appt_out_min < appt_in_min:
-            appt_out_min += 1440
         if not (check_out_min <= appt_in_min or check_in_min >= appt_out_min):
-            return False, f"With {appt.get('patient', 'patient')} ({appt_in.strftime('%H:%M')}-{appt_out.strftime('%H:%M')})"
+            return False, f"With {appt.get('patient', 'patient')} ({_hhmm(appt_in_min)}-{_hhmm(appt_out_min)})"
     return True, ""
 
 
-def get_assistant_status(
-    assistant: str,
-    df_schedule: pd.DataFrame,
+def _blocked_status(
+    assist_upper: str,
+    dept: str,
+    now,
     punch_map: dict,
-    time_blocks: list,
+    time_blocks: list | dict,
     today_str: str,
-    today_weekday: int,
-    weekly_off_map: dict,
-) -> dict[str, str]:
-    from services.profiles_cache import get_department_for_assistant
-    assist_upper = str(assistant).strip().upper()
-    now = now_ist()
-    current_min = now.hour * 60 + now.minute
-    dept = get_department_for_assistant(assist_upper)
-
+    off_set: set[str],
+) -> Optional[dict[str, str]]:
+    """BLOCKED status from punch state, weekly off or a time block; None when on duty."""
     pdata = punch_map.get(assist_upper, {})
     punch_in = pdata.get("punch_in", "")
     punch_out = pdata.get("punch_out", "")
 
     if not punch_in:
-        off_set = {str(n).strip().upper() for n in weekly_off_map.get(today_weekday, [])}
         if assist_upper in off_set:
             return {"status": "BLOCKED", "reason": f"Weekly off ({now.strftime('%A')})", "department": dept}
         return {"status": "BLOCKED", "reason": "Not punched in", "department": dept}
@@ -177,24 +278,49 @@ def get_assistant_status(
     blocked, reason = is_blocked_by_time_block_point(assist_upper, current_time, time_blocks, today_str)
     if blocked:
         return {"status": "BLOCKED", "reason": reason, "department": dept}
+    return None
 
-    schedule = get_assistant_schedule(assist_upper, df_schedule)
-    for appt in schedule:
+
+def _busy_with(appointments: list[dict[str, Any]], current_min: int) -> Optional[str]:
+    """Patient of the first appointment occupying ``current_min``, or None when free."""
+    for appt in appointments:
         s = str(appt.get("status", "")).upper()
-        appt_in = coerce_to_time_obj(appt.get("in_time"))
-        appt_out = coerce_to_time_obj(appt.get("out_time"))
+        in_m = appt.get("in_min")
+        out_m = appt.get("out_min")
         if "ON GOING" in s or "ONGOING" in s:
-            return {"status": "BUSY", "reason": f"With {appt.get('patient', 'patient')}", "department": dept}
-        if (appt_in is None or appt_out is None) and "ARRIVED" in s:
-            return {"status": "BUSY", "reason": f"With {appt.get('patient', 'patient')}", "department": dept}
-        if appt_in and appt_out:
-            in_m = appt_in.hour * 60 + appt_in.minute
-            out_m = appt_out.hour * 60 + appt_out.minute
-            if out_m < in_m:
-                out_m += 1440
-            if in_m <= current_min <= out_m:
-                return {"status": "BUSY", "reason": f"With {appt.get('patient', 'patient')}", "department": dept}
+            return appt.get("patient", "patient")
+        if (in_m is None or out_m is None) and "ARRIVED" in s:
+            return appt.get("patient", "patient")
+        if in_m is not None and out_m is not None and in_m <= current_min <= out_m:
+            return appt.get("patient", "patient")
+    return None
+
+
+def get_assistant_status(
+    assistant: str,
+    df_schedule: pd.DataFrame,
+    punch_map: dict,
+    time_blocks: list | dict,
+    today_str: str,
+    today_weekday: int,
+    weekly_off_map: dict,
+    schedule_index: Optional[dict] = None,
+) -> dict[str, str]:
+    from services.profiles_cache import get_department_for_assistant
+    assist_upper = str(assistant).strip().upper()
+    now = now_ist()
+    current_min = now.hour * 60 + now.minute
+    dept = get_department_for_assistant(assist_upper)
 
+    off_set = {str(n).strip().upper() for n in weekly_off_map.get(today_weekday, [])}
+    blocked = _blocked_status(assist_upper, dept, now, punch_map, time_blocks, today_str, off_set)
+    if blocked is not None:
+        return blocked
+
+    schedule = get_assistant_schedule(assist_upper, schedule_index if schedule_index is not None else df_schedule)
+    patient = _busy_with(schedule, current_min)
+    if patient is not None:
+        return {"status": "BUSY", "reason": f"With {patient}", "department": dept}
     return {"status": "FREE", "reason": "Available", "department": dept}
 
 
@@ -207,13 +333,33 @@ def get_all_assistant_statuses(
     weekly_off_map: dict,
     assistants: Optional[list] = None,
 ) -> dict[str, dict[str, str]]:
-    from services.profiles_cache import get_all_assistants
+    """Statuses for every assistant from one schedule pass plus O(1) checks per assistant."""
+    from services.profiles_cache import get_all_assistants, get_department_for_assistant
     if assistants is None:
         assistants = get_all_assistants()
-    return {
-        a.upper(): get_assistant_status(a, df_schedule, punch_map, time_blocks, today_str, today_weekday, weekly_off_map)
-        for a in assistants
-    }
+    now = now_ist()
+    current_min = now.hour * 60 + now.minute
+    block_index = index_time_blocks(time_blocks, today_str)
+    off_set = {str(n).strip().upper() for n in weekly_off_map.get(today_weekday, [])}
+    busy_now: dict[str, str] = {}
+    for assist_upper, appts in build_assistant_schedule_index(df_schedule).items():
+        patient = _busy_with(appts, current_min)
+        if patient is not None:
+            busy_now[assist_upper] = patient
+
+    statuses: dict[str, dict[str, str]] = {}
+    for a in assistants:
+        assist_upper = str(a).strip().upper()
+        dept = get_department_for_assistant(assist_upper)
+        status = _blocked_status(assist_upper, dept, now, punch_map, block_index, today_str, off_set)
+        if status is None:
+            patient = busy_now.get(assist_upper)
+            if patient is not None:
+                status = {"status": "BUSY", "reason": f"With {patient}", "department": dept}
+            else:
+                status = {"status": "FREE", "reason": "Available", "department": dept}
+        statuses[a.upper()] = status
+    return statuses
 
 
 def serialize_time_blocks(blocks: list[dict]) -> list[dict]:
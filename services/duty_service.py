@@ -2,9 +2,12 @@
 """Duty timer logic and pending duty computation."""
 
 from __future__ import annotations
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+from functools import lru_cache
 from typing import Any, Optional
 
+from services.utils import parse_iso_ts, now_ist
+
 
 def compute_pending_duties(
     assignments: list[dict[str, Any]],
@@ -13,34 +16,35 @@ def compute_pending_duties(
 ) -> dict[str, list[dict[str, Any]]]:
     week_start = today - timedelta(days=today.weekday())
     month_start = today.replace(day=1)
-    done_week: set = set()
-    done_month: set = set()
-    for r in runs:
-        if str(r.get("status", "")).upper() != "DONE":
-            continue
-        r_date = _parse_date(r.get("date"))
-        if r_date is None:
-            continue
-        if r_date >= week_start:
-            done_week.add(r.get("duty_id"))
-        if r_date >= month_start:
-            done_month.add(r.get("duty_id"))
+    done_dates = [
+        (r.get("duty_id"), _parse_date(r.get("date")))
+        for r in runs
+        if str(r.get("status", "")).upper() == "DONE"
+    ]
+    # Duty ids already done in the current period, keyed by assignment frequency.
+    done_by_freq: dict[str, frozenset] = {
+        "WEEKLY": frozenset(d for d, r_date in done_dates if r_date is not None and r_date >= week_start),
+        "MONTHLY": frozenset(d for d, r_date in done_dates if r_date is not None and r_date >= month_start),
+    }
     pending: dict[str, list] = {"WEEKLY": [], "MONTHLY": []}
     for a in assignments:
         freq = str(a.get("frequency", "")).upper()
-        duty_id = a.get("duty_id")
-        if freq == "WEEKLY" and duty_id not in done_week:
-            pending["WEEKLY"].append(a)
-        elif freq == "MONTHLY" and duty_id not in done_month:
-            pending["MONTHLY"].append(a)
+        done_ids = done_by_freq.get(freq)
+        if done_ids is not None and a.get("duty_id") not in done_ids:
+            pending[freq].append(a)
     return pending
 
 
+@lru_cache(maxsize=1024)
+def _parse_due(due_at_iso: str) -> Optional[datetime]:
+    return parse_iso_ts(due_at_iso)
+
+
 def format_remaining_time(due_at_iso: Optional[str]) -> str:
-    from services.utils import parse_iso_ts, now_ist
     if not due_at_iso:
         return ""
-    due_dt = parse_iso_ts(due_at_iso)
+    # Parsed once per distinct due_at; the countdown itself uses the live clock.
+    due_dt = _parse_due(due_at_iso)
     if not due_dt:
         return ""
     delta = due_dt - now_ist()
@@ -56,7 +60,6 @@ def _parse_date(value) -> Optional[date]:
     if value is None:
         return None
     try:
-        from datetime import datetime
         if isinstance(value, date):
             return value
         return datetime.strptime(str(value).strip()[:10], "%Y-%m-%d").date()
@@ -3,60 +3,59 @@
 
 from __future__ import annotations
 from typing import Any
-import json
-from pathlib import Path
+import pandas as pd
 
-from services.utils import norm_name, unique_preserve_order, is_blank
+from services.utils import norm_name, unique_preserve_order, load_alloc_config
 from config.constants import DEFAULT_DEPARTMENTS
 
 
-def _parse_weekly_off_days(value: Any) -> list[int]:
-    WEEKDAY_MAP = {
-        "MON": 0, "MONDAY": 0,
-        "TUE": 1, "TUESDAY": 1,
-        "WED": 2, "WEDNESDAY": 2,
-        "THU": 3, "THURSDAY": 3,
-        "FRI": 4, "FRIDAY": 4,
-        "SAT": 5, "SATURDAY": 5,
-        "SUN": 6, "SUNDAY": 6,
-    }
-    if not value or is_blank(value):
-        return []
-    s = str(value).strip()
-    out = []
-    for part in s.split(","):
-        part = part.strip().upper()
-        if not part:
-            continue
-        if part in WEEKDAY_MAP:
-            out.append(WEEKDAY_MAP[part])
-        else:
-            try:
-                idx = int(part)
-                if 0 <= idx <= 6:
-                    out.append(idx)
-            except Exception:
-                pass
+_WEEKDAY_MAP = {
+    "MON": 0, "MONDAY": 0,
+    "TUE": 1, "TUESDAY": 1,
+    "WED": 2, "WEDNESDAY": 2,
+    "THU": 3, "THURSDAY": 3,
+    "FRI": 4, "FRIDAY": 4,
+    "SAT": 5, "SATURDAY": 5,
+    "SUN": 6, "SUNDAY": 6,
+}
+
+
+def _weekly_off_map(names: list[str], weekly_offs: list) -> dict[int, list[str]]:
+    """Weekday index (0=Mon) -> names whose comma-separated weekly_off lists that day.
+
+    Entries may be day names, three-letter abbreviations or indexes 0-6;
+    anything else is ignored. Names keep their row order within each day.
+    """
+    out: dict[int, list[str]] = {i: [] for i in range(7)}
+    if not names:
+        return out
+    parts = (
+        pd.Series(weekly_offs, dtype=object).astype("string").fillna("")
+        .str.upper().str.split(",").explode().str.strip()
+    )
+    owner_pos = parts.index.to_numpy()
+    parts = parts.reset_index(drop=True)
+    days = parts.map(_WEEKDAY_MAP)
+    numeric = pd.to_numeric(parts.where(parts.str.fullmatch(r"\d+").fillna(False)), errors="coerce")
+    days = days.fillna(numeric.where(numeric.between(0, 6))).dropna().astype(int)
+    for day, pos in zip(days.tolist(), owner_pos[days.index.to_numpy()].tolist()):
+        out[day].append(names[pos])
     return out
 
 
-def _load_alloc_config() -> dict[str, Any]:
-    try:
-        path = Path(__file__).parent.parent / "allocation_rules.json"
-        if path.exists():
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            return data if isinstance(data, dict) else {}
-    except Exception:
-        pass
-    return {}
+def _column_values(df, col: str, upper: bool = False) -> list:
+    """Column as a list ("" per row when missing); ``upper`` strips/upper-cases column-wise."""
+    if col not in df.columns:
+        return [""] * len(df)
+    series = df[col]
+    if upper:
+        series = series.fillna("").astype(str).str.strip().str.upper()
+    return series.tolist()
 
 
 def build_profiles_cache(assistants_df, doctors_df) -> dict[str, Any]:
     """Build lookup maps from loaded DataFrames."""
-    import pandas as pd
-
-    config = _load_alloc_config()
+    config = load_alloc_config()
     depts_cfg = config.get("departments", {}) if isinstance(config, dict) else {}
 
     config_doctor_map: dict[str, str] = {}
@@ -88,19 +87,26 @@ def build_profiles_cache(assistants_df, doctors_df) -> dict[str, Any]:
     assistant_dept_map: dict[str, str] = {}
     assistant_prefs: dict[str, dict] = {}
     assistants_by_dept: dict[str, list[str]] = {}
-    weekly_off_map: dict[int, list[str]] = {i: [] for i in range(7)}
+    off_names: list[str] = []
+    off_values: list = []
 
     if assistants_df is not None and not assistants_df.empty:
-        for _, row in assistants_df.iterrows():
-            name = str(row.get("name", "")).strip().upper()
+        rows = zip(
+            _column_values(assistants_df, "name", upper=True),
+            _column_values(assistants_df, "status", upper=True),
+            _column_values(assistants_df, "department", upper=True),
+            _column_values(assistants_df, "pref_first"),
+            _column_values(assistants_df, "pref_second"),
+            _column_values(assistants_df, "pref_third"),
+            _column_values(assistants_df, "weekly_off"),
+        )
+        for name, status, dept, pref_first, pref_second, pref_third, weekly_off in rows:
             if not name:
                 continue
-            status = str(row.get("status", "")).strip().upper()
             if status and status not in ("", "ACTIVE"):
                 continue
             assistants_list.append(name)
             key = norm_name(name)
-            dept = str(row.get("department", "")).strip().upper()
             if not dept:
                 dept = config_assistant_map.get(key, "SHARED")
             if not dept:
@@ -110,39 +116,39 @@ def build_profiles_cache(assistants_df, doctors_df) -> dict[str, Any]:
             if name not in assistants_by_dept[dept]:
                 assistants_by_dept[dept].append(name)
             assistant_prefs[key] = {
-                "FIRST": row.get("pref_first", ""),
-                "SECOND": row.get("pref_second", ""),
-                "Third": row.get("pref_third", ""),
+                "FIRST": pref_first,
+                "SECOND": pref_second,
+                "Third": pref_third,
             }
-            try:
-                for idx in _parse_weekly_off_days(row.get("weekly_off", "")):
-                    weekly_off_map[idx].append(name)
-            except Exception:
-                pass
+            off_names.append(name)
+            off_values.append(weekly_off)
+    weekly_off_map = _weekly_off_map(off_names, off_values)
 
     doctors_list: list[str] = []
     doctor_dept_map: dict[str, str] = {}
-    doctor_weekly_off_map: dict[int, list[str]] = {i: [] for i in range(7)}
+    off_names = []
+    off_values = []
 
     if doctors_df is not None and not doctors_df.empty:
-        for _, row in doctors_df.iterrows():
-            name = str(row.get("name", "")).strip().upper()
+        rows = zip(
+            _column_values(doctors_df, "name", upper=True),
+            _column_values(doctors_df, "status", upper=True),
+            _column_values(doctors_df, "department", upper=True),
+            _column_values(doctors_df, "weekly_off"),
+        )
+        for name, status, dept, weekly_off in rows:
             if not name:
                 continue
-            status = str(row.get("status", "")).strip().upper()
             if status and status not in ("", "ACTIVE"):
                 continue
             doctors_list.append(name)
             key = norm_name(name)
-            dept = str(row.get("department", "")).strip().upper()
             if not dept:
                 dept = config_doctor_map.get(key, "")
             doctor_dept_map[key] = dept
-            try:
-                for idx in _parse_weekly_off_days(row.get("weekly_off", "")):
-                    doctor_weekly_off_map[idx].append(name)
-            except Exception:
-                pass
+            off_names.append(name)
+            off_values.append(weekly_off)
+    doctor_weekly_off_map = _weekly_off_map(off_names, off_values)
 
     return {
         "assistants_list": assistants_list,
@@ -202,7 +208,7 @@ def get_assistants_for_department(department: str, cache_bust: int = 0) -> list[
         return dept_list
     # Fallback to allocation_rules.json
     try:
-        cfg = _load_alloc_config()
+        cfg = load_alloc_config()
         depts = cfg.get("departments", {})
         for key, val in depts.items():
             if str(key).strip().upper() == dept_upper and isinstance(val, dict):
@@ -2,66 +2,93 @@
 """15-minute appointment reminder logic."""
 
 from __future__ import annotations
-from typing import Any
+from datetime import datetime
+from typing import Any, Optional
+import numpy as np
 import pandas as pd
 
-from services.utils import coerce_to_time_obj, now_ist, parse_iso_ts
-from config.constants import TERMINAL_STATUSES
+from services.utils import now_ist, parse_iso_ts
+from services.schedule_ops import add_computed_columns, terminal_mask, CONTENT_VERSION_ATTR
 
 REMINDER_ADVANCE_MINUTES = 15
 
 
-def get_due_reminders(df_schedule: pd.DataFrame) -> list[dict[str, Any]]:
+def _text_column(df: pd.DataFrame, col: str) -> pd.Series:
+    if col not in df.columns:
+        return pd.Series("", index=df.index)
+    return df[col].astype("string[pyarrow]").str.strip().fillna("")
+
+
+def get_due_reminders(df_schedule: pd.DataFrame, now: Optional[datetime] = None) -> list[dict[str, Any]]:
     """Return appointments due for a reminder (within 15 min, not dismissed/snoozed)."""
     if df_schedule is None or df_schedule.empty:
         return []
-    now = now_ist()
+    now = now or now_ist()
+    if "In_min" not in df_schedule.columns:
+        df_schedule = add_computed_columns(df_schedule, now)
     current_min = now.hour * 60 + now.minute
+
+    status = _text_column(df_schedule, "STATUS").str.upper()
+    # Masks are plain numpy bools: string[pyarrow] comparisons return nullable
+    # booleans, which do not survive setitem and ``~`` intact.
+    dismissed = _text_column(df_schedule, "REMINDER_DISMISSED").str.lower().isin(["1", "true", "yes"])
+    mask = ~dismissed.to_numpy(dtype=bool) & ~terminal_mask(df_schedule)
+
+    # Snoozes are rare; only non-empty values are parsed.
+    snooze = _text_column(df_schedule, "REMINDER_SNOOZE_UNTIL")
+    snoozed = mask & snooze.ne("").to_numpy(dtype=bool)
+    if snoozed.any():
+        def still_snoozed(value: str) -> bool:
+            snooze_dt = parse_iso_ts(value)
+            return bool(snooze_dt and snooze_dt > now)
+        still = np.zeros(len(mask), dtype=bool)
+        still[snoozed] = snooze[snoozed].map(still_snoozed).to_numpy(dtype=bool)
+        mask &= ~still
+    if not mask.any():
+        return []
+
+    candidates = df_schedule.loc[mask]
+    minutes_until = candidates["In_min"] - current_min
+    in_window = minutes_until.between(0, REMINDER_ADVANCE_MINUTES)
+    due_rows = candidates.loc[in_window]
+    if due_rows.empty:
+        return []
+
+    cols = [c for c in ("REMINDER_ROW_ID", "Patient Name", "In Time", "DR.", "OP") if c in due_rows.columns]
     due = []
-    for _, row in df_schedule.iterrows():
-        status = str(row.get("STATUS", "")).strip().upper()
-        if status in TERMINAL_STATUSES:
-            continue
-        dismissed = str(row.get("REMINDER_DISMISSED", "")).strip().lower()
-        if dismissed in {"1", "true", "yes"}:
-            continue
-        snooze_until = str(row.get("REMINDER_SNOOZE_UNTIL", "")).strip()
-        if snooze_until:
-            snooze_dt = parse_iso_ts(snooze_until)
-            if snooze_dt and snooze_dt > now:
-                continue
-        in_obj = coerce_to_time_obj(row.get("In Time"))
-        if in_obj is None:
-            continue
-        in_min = in_obj.hour * 60 + in_obj.minute
-        minutes_until = in_min - current_min
-        if 0 <= minutes_until <= REMINDER_ADVANCE_MINUTES:
-            due.append({
-                "row_id": str(row.get("REMINDER_ROW_ID", "")).strip(),
-                "patient": row.get("Patient Name", "Unknown"),
-                "in_time": row.get("In Time"),
-                "doctor": row.get("DR.", ""),
-                "op": row.get("OP", ""),
-                "minutes_until": minutes_until,
-                "status": status,
-            })
+    for record, mins, row_status in zip(
+        due_rows[cols].to_dict("records"),
+        minutes_until[in_window].astype(int).tolist(),
+        status[mask][in_window].tolist(),
+    ):
+        due.append({
+            "row_id": str(record.get("REMINDER_ROW_ID", "")).strip(),
+            "patient": record.get("Patient Name", "Unknown"),
+            "in_time": record.get("In Time"),
+            "doctor": record.get("DR.", ""),
+            "op": record.get("OP", ""),
+            "minutes_until": mins,
+            "status": row_status,
+        })
     return due
 
 
 def dismiss_reminder(df: pd.DataFrame, row_id: str) -> pd.DataFrame:
+    """Mark the reminder for ``row_id`` dismissed, in place on the session-owned frame."""
     if "REMINDER_ROW_ID" not in df.columns:
         return df
-    df = df.copy()
     mask = df["REMINDER_ROW_ID"].astype(str) == row_id
     df.loc[mask, "REMINDER_DISMISSED"] = "1"
+    df.attrs.pop(CONTENT_VERSION_ATTR, None)
     return df
 
 
 def snooze_reminder(df: pd.DataFrame, row_id: str, snooze_minutes: int = 5) -> pd.DataFrame:
+    """Snooze the reminder for ``row_id``, in place on the session-owned frame."""
     from datetime import timedelta
     if "REMINDER_ROW_ID" not in df.columns:
         return df
-    df = df.copy()
     mask = df["REMINDER_ROW_ID"].astype(str) == row_id
     df.loc[mask, "REMINDER_SNOOZE_UNTIL"] = (now_ist() + timedelta(minutes=snooze_minutes)).isoformat()
+    df.attrs.pop(CONTENT_VERSION_ATTR, None)
     return df
@@ -2,189 +2,538 @@
 """Schedule business logic: filtering, status transitions, workload."""
 
 from __future__ import annotations
-from typing import Optional
+from datetime import date, datetime
+from typing import NamedTuple, Optional
+import copy
+import os
 import uuid
+import numpy as np
 import pandas as pd
 
 from services.utils import coerce_to_time_obj, time_to_minutes, now_ist, is_blank
-from config.constants import SCHEDULE_COLUMNS, TERMINAL_STATUSES
+from config.constants import SCHEDULE_COLUMNS, TERMINAL_STATUSES, ONGOING_STATUSES, OP_ROOMS_SORTED
+
+
+DATE_EPOCH_COL = "_DATE_EPOCH"
+START_EPOCH_COL = "_START_EPOCH"
+_EPOCH_DAY = date(1970, 1, 1)
+_NO_EPOCH = np.iinfo("int64").min
+
+# Bump when ensure_schedule_columns / ensure_row_ids / add_computed_columns change.
+SCHEMA_VERSION = 5
+SCHEMA_VERSION_ATTR = "_schema_version"
+_COMPUTED_COLUMNS = ("In_min", "Out_min", "Is_Ongoing", DATE_EPOCH_COL, START_EPOCH_COL)
+# Recomputed on every load, so never persisted.
+INTERNAL_COLUMNS = (DATE_EPOCH_COL, START_EPOCH_COL)
+
+ROW_ID_INDEX_ATTR = "_rowid_index"
+OP_OPTIONS_ATTR = "_op_union"
+START_ORDER_ATTR = "_start_order"
+DATE_ISO_ATTR = "_date_homogeneous"
+UPPER_COLUMNS_ATTR = "_upper_columns"
+# Opaque token stamped by save_now; any edit drops it. Copies of attrs get a fresh object.
+CONTENT_VERSION_ATTR = "content_version"
+TERMINAL_MASK_ATTR = "_is_terminal"
+_DERIVED_ATTRS = (
+    SCHEMA_VERSION_ATTR, ROW_ID_INDEX_ATTR, OP_OPTIONS_ATTR, START_ORDER_ATTR, DATE_ISO_ATTR,
+    UPPER_COLUMNS_ATTR, CONTENT_VERSION_ATTR, TERMINAL_MASK_ATTR,
+)
+_IMMUTABLE_ATTRS = (SCHEMA_VERSION_ATTR, OP_OPTIONS_ATTR, DATE_ISO_ATTR)
+_ISO_DATE_PREFIX = r"\d{4}-\d{2}-\d{2}"
+_ASSIGNMENT_COLUMNS = ("FIRST", "SECOND", "Third")
+_TEXT_COLUMNS = ("Patient Name", "DR.", *_ASSIGNMENT_COLUMNS, "OP", "STATUS")
+_HHMM_PATTERN = r"^\s*(\d{1,2}):(\d{1,2})(?::\d{1,2}(?:\.\d+)?)?\s*$"
 
 
 def ensure_schedule_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Add missing schedule columns and store the filtered-on text columns as Arrow strings.
+
+    The text columns are blank-filled so row-level code never sees ``pd.NA``;
+    saving converts them back to plain objects.
+    """
     for col in SCHEDULE_COLUMNS:
         if col not in df.columns:
             df[col] = ""
+    for col in _TEXT_COLUMNS:
+        df[col] = df[col].astype("string[pyarrow]").fillna("")
+    df.attrs.setdefault("meta", {})
     return df
 
 
+class _RowIdIndex(dict):
+    """REMINDER_ROW_ID -> row position map kept in ``df.attrs``.
+
+    Not carried over when pandas copies ``attrs``: a copied frame rebuilds
+    its own map on the first lookup.
+    """
+
+    def __deepcopy__(self, memo):
+        return None
+
+
+def _row_id_strings(df: pd.DataFrame) -> pd.Series:
+    """REMINDER_ROW_ID as stripped Arrow strings; free once ensure_row_ids has run."""
+    ids = df["REMINDER_ROW_ID"]
+    if ids.dtype == "string[pyarrow]":
+        return ids
+    return ids.astype("string[pyarrow]").str.strip()
+
+
+def _new_row_ids(n: int) -> list[str]:
+    """``n`` random UUID4 strings from a single os.urandom call."""
+    raw = os.urandom(16 * n)
+    return [str(uuid.UUID(bytes=raw[i:i + 16], version=4)) for i in range(0, 16 * n, 16)]
+
+
 def ensure_row_ids(df: pd.DataFrame) -> pd.DataFrame:
-    """Ensure every row has a unique REMINDER_ROW_ID."""
+    """Ensure every row has a unique REMINDER_ROW_ID, stored as stripped ``string[pyarrow]``."""
     if "REMINDER_ROW_ID" not in df.columns:
         df["REMINDER_ROW_ID"] = ""
-    mask = df["REMINDER_ROW_ID"].astype(str).str.strip().isin(["", "nan", "none", "NaT"])
+    ids = _row_id_strings(df)
+    mask = ids.fillna("").isin(["", "nan", "none", "NaT", "<NA>"]).to_numpy(dtype=bool)
     if mask.any():
-        df.loc[mask, "REMINDER_ROW_ID"] = [str(uuid.uuid4()) for _ in range(int(mask.sum()))]
+        ids = ids.copy()
+        ids[mask] = _new_row_ids(int(mask.sum()))
+    df["REMINDER_ROW_ID"] = ids
+    build_row_id_index(df)
     return df
 
 
-def add_computed_columns(df: pd.DataFrame) -> pd.DataFrame:
-    """Add In_min, Out_min, Is_Ongoing columns."""
-    now = now_ist()
-    current_min = now.hour * 60 + now.minute
+def build_row_id_index(df: pd.DataFrame) -> dict[str, int]:
+    """(Re)build the REMINDER_ROW_ID -> position index stored on ``df.attrs``."""
+    index = _RowIdIndex(
+        (rid, pos) for pos, rid in enumerate(_row_id_strings(df).fillna(""))
+    )
+    df.attrs[ROW_ID_INDEX_ATTR] = index
+    return index
+
+
+def detach_attrs(df: pd.DataFrame) -> pd.DataFrame:
+    """Give ``df`` attrs it owns: ``meta`` deep-copied, mutable derived caches dropped.
+
+    Immutable tags (schema version, OP options, ISO-date flag) are kept so
+    prepare_schedule can still take its fast path.
+    """
+    keep = {
+        key: value for key, value in df.attrs.items()
+        if key not in _DERIVED_ATTRS or key in _IMMUTABLE_ATTRS
+    }
+    df.attrs = copy.deepcopy(keep)
+    return df
+
 
-    def to_min(val):
-        if is_blank(val):
-            return None
-        return time_to_minutes(val)
+def clear_derived_attrs(df: pd.DataFrame) -> None:
+    """Drop values cached on ``df.attrs`` after rows are added, removed or edited."""
+    for key in _DERIVED_ATTRS:
+        df.attrs.pop(key, None)
+
+
+def find_row_position(df: pd.DataFrame, row_id: str) -> Optional[int]:
+    """Return the position of ``row_id`` in ``df``, or None when it is not present."""
+    if "REMINDER_ROW_ID" not in df.columns:
+        return None
+    rid = str(row_id).strip()
+    index = df.attrs.get(ROW_ID_INDEX_ATTR)
+    if isinstance(index, dict):
+        pos = index.get(rid)
+        if pos is not None and pos < len(df) and str(df["REMINDER_ROW_ID"].iat[pos]).strip() == rid:
+            return pos
+    # Missing or stale index (filtered view, appended rows): rebuild once.
+    return build_row_id_index(df).get(rid)
+
+
+def delete_row(df: pd.DataFrame, row_id: str) -> pd.DataFrame:
+    """Remove the row with the given REMINDER_ROW_ID from ``df`` in place and return it.
+
+    The schedule frame is owned by session state (other holders only keep
+    shallow copies), so mutating it avoids a masked copy per deletion.
+    """
+    pos = find_row_position(df, row_id)
+    if pos is None:
+        return df
+    df.drop(index=df.index[pos], inplace=True)
+    df.reset_index(drop=True, inplace=True)
+    clear_derived_attrs(df)
+    return df
+
+
+def _day_epoch(day: date) -> int:
+    """Seconds since 1970-01-01 for midnight of ``day`` (naive calendar day)."""
+    return (day - _EPOCH_DAY).days * 86400
+
+
+def _date_epoch_values(dates: pd.Series) -> np.ndarray:
+    """int64 epoch seconds of the YYYY-MM-DD prefix of each value (NaT -> int64 min)."""
+    parsed = pd.to_datetime(dates.astype(str).str.slice(0, 10), format="%Y-%m-%d", errors="coerce")
+    return parsed.to_numpy(dtype="datetime64[s]").astype("int64")
+
+
+def _dates_all_iso(dates: pd.Series) -> bool:
+    """True when every value starts with a YYYY-MM-DD prefix (no blanks, no legacy formats)."""
+    if dates.empty:
+        return False
+    matched = dates.astype("string[pyarrow]").str.strip().str.match(_ISO_DATE_PREFIX)
+    return bool(matched.fillna(False).all())
+
+
+def add_computed_columns(df: pd.DataFrame, now: Optional[datetime] = None) -> pd.DataFrame:
+    """Add In_min, Out_min, Is_Ongoing, _DATE_EPOCH columns.
+
+    Also records in ``attrs[DATE_ISO_ATTR]`` whether every DATE is ISO-prefixed,
+    so date filters can skip the legacy-format parsing passes. ``now`` defaults
+    to the current IST time; callers rendering one view pass a single value.
+    """
+    now = now or now_ist()
+    current_min = now.hour * 60 + now.minute
 
     df = df.copy()
-    df["In_min"] = df["In Time"].apply(to_min)
-    df["Out_min"] = df["Out Time"].apply(to_min)
-    df["Is_Ongoing"] = df.apply(
-        lambda r: bool(
-            r["In_min"] is not None and r["Out_min"] is not None
-            and r["In_min"] <= current_min <= r["Out_min"]
-        ),
-        axis=1,
+    df["In_min"] = _minutes_column(df["In Time"])
+    df["Out_min"] = _minutes_column(df["Out Time"])
+    df["Is_Ongoing"] = _ongoing_flags(df, current_min)
+    day_epoch = _date_epoch_values(df["DATE"]) if "DATE" in df.columns else np.full(len(df), _NO_EPOCH)
+    in_min = df["In_min"].to_numpy(dtype="float64")
+    has_start = (day_epoch != _NO_EPOCH) & ~np.isnan(in_min)
+    df[DATE_EPOCH_COL] = day_epoch
+    df[START_EPOCH_COL] = np.where(
+        has_start,
+        np.where(has_start, day_epoch, 0) + np.nan_to_num(in_min).astype("int64") * 60,
+        _NO_EPOCH,
     )
+    df.attrs[DATE_ISO_ATTR] = "DATE" in df.columns and _dates_all_iso(df["DATE"])
     return df
 
 
-def filter_ongoing(df: pd.DataFrame) -> pd.DataFrame:
-    if "In_min" not in df.columns:
-        df = add_computed_columns(df)
-    ongoing_mask = df.get("Is_Ongoing", pd.Series(False, index=df.index))
-    status_ongoing = df.get("STATUS", pd.Series(dtype=str)).astype(str).str.upper().str.contains("ON GOING|ONGOING", na=False)
-    return df[ongoing_mask | status_ongoing].copy()
+def _cell_minutes(value) -> Optional[int]:
+    return None if is_blank(value) else time_to_minutes(value)
 
 
-def filter_upcoming(df: pd.DataFrame, minutes_ahead: int = 60) -> pd.DataFrame:
-    if "In_min" not in df.columns:
+def _minutes_column(values: pd.Series) -> pd.Series:
+    """Vectorised ``time_to_minutes`` as float64 minutes (NaN when missing).
+
+    24-hour ``HH:MM[:SS]`` text (and ``time`` objects, which stringify that
+    way) is parsed column-wise; only the leftovers — AM/PM strings, numeric
+    cells, out-of-range values — go through the scalar parser.
+    """
+    text = values.astype("string[pyarrow]")
+    parts = text.str.extract(_HHMM_PATTERN)
+    hours = pd.to_numeric(parts[0], errors="coerce")
+    mins = pd.to_numeric(parts[1], errors="coerce")
+    minutes = (hours * 60 + mins).where((hours < 24) & (mins < 60)).astype("float64")
+    rest = minutes.isna().to_numpy() & text.str.strip().fillna("").ne("").to_numpy()
+    if rest.any():
+        minutes[rest] = pd.to_numeric(values[rest].map(_cell_minutes), errors="coerce").to_numpy(dtype="float64")
+    return minutes
+
+
+def _ongoing_flags(df: pd.DataFrame, current_min: int) -> pd.Series:
+    in_min = pd.to_numeric(df["In_min"], errors="coerce")
+    out_min = pd.to_numeric(df["Out_min"], errors="coerce")
+    return (in_min <= current_min) & (current_min <= out_min)
+
+
+def prepare_schedule(df: pd.DataFrame, now: Optional[datetime] = None) -> pd.DataFrame:
+    """Run ensure_schedule_columns → ensure_row_ids → add_computed_columns once per frame.
+
+    A frame already tagged with the current SCHEMA_VERSION (and row count) only
+    gets its time-dependent Is_Ongoing flag refreshed.
+    """
+    if (
+        df.attrs.get(SCHEMA_VERSION_ATTR) == (SCHEMA_VERSION, len(df))
+        and all(col in df.columns for col in _COMPUTED_COLUMNS)
+    ):
+        now = now or now_ist()
+        df["Is_Ongoing"] = _ongoing_flags(df, now.hour * 60 + now.minute)
+        return df
+    df = ensure_schedule_columns(df)
+    df = ensure_row_ids(df)
+    df = add_computed_columns(df, now)
+    df.attrs[SCHEMA_VERSION_ATTR] = (SCHEMA_VERSION, len(df))
+    return df
+
+
+def filter_by_day(df: pd.DataFrame, day: date) -> pd.DataFrame:
+    """Rows whose DATE falls on ``day``, compared on the precomputed epoch column."""
+    if DATE_EPOCH_COL not in df.columns:
         df = add_computed_columns(df)
-    now = now_ist()
-    current_min = now.hour * 60 + now.minute
+    start = _day_epoch(day)
+    epochs = df[DATE_EPOCH_COL].to_numpy()
+    return df[(epochs >= start) & (epochs < start + 86400)]
+
+
+def strict_date_mask(date_series: pd.Series, selected_date, iso_only: bool = False) -> tuple[pd.Series, str]:
+    """Build strict date match mask with tolerant normalization for legacy date strings.
+
+    ``iso_only`` means every value is known to start with YYYY-MM-DD, in which
+    case the direct match is exact and the parsing fallbacks are skipped.
+    """
+    target_dt = pd.to_datetime(selected_date, errors="coerce")
+    if pd.isna(target_dt):
+        return pd.Series(False, index=date_series.index), ""
+
+    formatted_date = target_dt.strftime("%Y-%m-%d")
+    raw_dates = date_series.astype("string[pyarrow]").fillna("").str.strip()
+
+    # Direct match handles ISO DATE and ISO TIMESTAMP strings.
+    direct_match = (
+        raw_dates.eq(formatted_date)
+        | raw_dates.str.startswith(f"{formatted_date}T")
+        | raw_dates.str.startswith(f"{formatted_date} ")
+    )
+    if iso_only:
+        return direct_match.fillna(False), formatted_date
+
+    raw_lower = raw_dates.str.lower()
+    parse_input = raw_dates.where(~raw_lower.isin(["", "nan", "none", "nat"]))
+    normalized_default = pd.to_datetime(parse_input, errors="coerce").dt.strftime("%Y-%m-%d")
+    normalized_dayfirst = pd.to_datetime(parse_input, errors="coerce", dayfirst=True).dt.strftime("%Y-%m-%d")
+
+    # Support legacy Excel serial dates if any historical rows were imported that way.
+    numeric_dates = pd.to_numeric(parse_input, errors="coerce")
+    normalized_excel = pd.to_datetime(
+        numeric_dates, unit="D", origin="1899-12-30", errors="coerce"
+    ).dt.strftime("%Y-%m-%d")
+
     mask = (
-        df["In_min"].notna() &
-        (df["In_min"] > current_min) &
-        (df["In_min"] <= current_min + minutes_ahead)
+        direct_match
+        | normalized_default.eq(formatted_date)
+        | normalized_dayfirst.eq(formatted_date)
+        | normalized_excel.eq(formatted_date)
     )
-    status_col = df.get("STATUS", pd.Series(dtype=str)).astype(str).str.upper()
-    not_terminal = ~status_col.isin(TERMINAL_STATUSES)
-    return df[mask & not_terminal].copy()
+    return mask.fillna(False), formatted_date
+
+
+def filter_ongoing(df: pd.DataFrame) -> pd.DataFrame:
+    if "In_min" not in df.columns:
+        df = add_computed_columns(df)
+    ongoing_mask = df.get("Is_Ongoing", pd.Series(False, index=df.index)).to_numpy(dtype=bool)
+    if "STATUS" in df.columns:
+        # STATUS holds a handful of distinct values: match those, then hash-lookup the column.
+        status = df["STATUS"]
+        hits = [v for v in status.dropna().unique() if any(s in str(v).upper() for s in ONGOING_STATUSES)]
+        ongoing_mask = ongoing_mask | status.isin(hits).to_numpy(dtype=bool)
+    return df[ongoing_mask]
+
+
+class _TerminalMask(NamedTuple):
+    """Per-row "STATUS is terminal" flags cached on ``df.attrs`` for one index object."""
+    index: pd.Index
+    values: np.ndarray
+
+    def __deepcopy__(self, memo):
+        return None
+
+
+def terminal_mask(df: pd.DataFrame) -> np.ndarray:
+    """Boolean array, True where the stripped, upper-cased STATUS is in TERMINAL_STATUSES.
+
+    Cached per prepared frame; update_status keeps the cached flags in step.
+    Treat the result as read-only.
+    """
+    cached = df.attrs.get(TERMINAL_MASK_ATTR)
+    if isinstance(cached, _TerminalMask) and cached.index is df.index and len(cached.values) == len(df):
+        return cached.values
+    if "STATUS" in df.columns:
+        status = df["STATUS"].astype("string[pyarrow]").str.strip().str.upper()
+        values = status.isin(TERMINAL_STATUSES).to_numpy(dtype=bool)
+    else:
+        values = np.zeros(len(df), dtype=bool)
+    if df.attrs.get(SCHEMA_VERSION_ATTR) == (SCHEMA_VERSION, len(df)):
+        df.attrs[TERMINAL_MASK_ATTR] = _TerminalMask(df.index, values)
+    return values
+
+
+class _StartOrder(NamedTuple):
+    """Row positions sorted by _START_EPOCH, cached on ``df.attrs`` per prepared frame."""
+    tag: tuple
+    order: np.ndarray
+    starts: np.ndarray
+
+    def __deepcopy__(self, memo):
+        return None
+
+
+def _sorted_starts(df: pd.DataFrame) -> _StartOrder:
+    tag = (SCHEMA_VERSION, len(df))
+    cached = df.attrs.get(START_ORDER_ATTR)
+    if isinstance(cached, _StartOrder) and cached.tag == tag and df.attrs.get(SCHEMA_VERSION_ATTR) == tag:
+        return cached
+    starts = df[START_EPOCH_COL].to_numpy(dtype="int64")
+    order = np.argsort(starts, kind="mergesort")
+    result = _StartOrder(tag, order, starts[order])
+    if df.attrs.get(SCHEMA_VERSION_ATTR) == tag:
+        df.attrs[START_ORDER_ATTR] = result
+    return result
+
+
+def filter_upcoming(df: pd.DataFrame, minutes_ahead: int = 60, now: Optional[datetime] = None) -> pd.DataFrame:
+    """Today's non-terminal appointments starting within the next ``minutes_ahead`` minutes."""
+    now = now or now_ist()
+    if START_EPOCH_COL not in df.columns:
+        df = add_computed_columns(df, now)
+    now_s = _day_epoch(now.date()) + (now.hour * 60 + now.minute) * 60
+    sorted_starts = _sorted_starts(df)
+    lo = np.searchsorted(sorted_starts.starts, now_s, side="right")
+    hi = np.searchsorted(sorted_starts.starts, now_s + minutes_ahead * 60, side="right")
+    positions = np.sort(sorted_starts.order[lo:hi])
+    return df.iloc[positions[~terminal_mask(df)[positions]]]
+
+
+def get_op_options(df: pd.DataFrame) -> list[str]:
+    """Sorted OP rooms (OP_ROOMS + values present in df), cached on ``df.attrs``."""
+    ops = df.attrs.get(OP_OPTIONS_ATTR)
+    if not isinstance(ops, tuple):
+        df_ops = set(df["OP"].dropna().astype(str).str.strip().unique()) if "OP" in df.columns else set()
+        extra = {o for o in df_ops if o}.difference(OP_ROOMS_SORTED)
+        ops = tuple(sorted(extra.union(OP_ROOMS_SORTED))) if extra else OP_ROOMS_SORTED
+        df.attrs[OP_OPTIONS_ATTR] = ops
+    return list(ops)
+
+
+class _UpperColumns(dict):
+    """Column name -> (index, stripped upper-case values) cached on ``df.attrs``.
+
+    Not carried over when pandas copies ``attrs``, and an entry is only used
+    by a frame whose index object is the one it was computed against.
+    """
+
+    def __deepcopy__(self, memo):
+        return None
+
+
+def upper_column(df: pd.DataFrame, col: str) -> pd.Series:
+    """``df[col]`` stripped and upper-cased (blank for missing), cached per prepared frame."""
+    cache = df.attrs.get(UPPER_COLUMNS_ATTR)
+    entry = cache.get(col) if isinstance(cache, _UpperColumns) else None
+    if entry is not None and entry[0] is df.index:
+        return entry[1]
+    values = df[col].astype("string[pyarrow]").str.strip().str.upper().fillna("")
+    if df.attrs.get(SCHEMA_VERSION_ATTR) == (SCHEMA_VERSION, len(df)):
+        if not isinstance(cache, _UpperColumns):
+            cache = df.attrs[UPPER_COLUMNS_ATTR] = _UpperColumns()
+        cache[col] = (df.index, values)
+    return values
+
+
+def forget_upper_columns(df: pd.DataFrame, cols) -> None:
+    """Stop ``df`` using cached upper-case values for ``cols`` after writing to them."""
+    if isinstance(df.attrs.get(UPPER_COLUMNS_ATTR), _UpperColumns):
+        df.attrs[UPPER_COLUMNS_ATTR] = _UpperColumns(
+            (col, entry) for col, entry in df.attrs[UPPER_COLUMNS_ATTR].items() if col not in cols
+        )
 
 
 def filter_by_op(df: pd.DataFrame, op: str) -> pd.DataFrame:
     if "OP" not in df.columns:
         return pd.DataFrame(columns=df.columns)
-    return df[df["OP"].astype(str).str.strip().str.upper() == op.strip().upper()].copy()
+    return df[(upper_column(df, "OP") == op.strip().upper()).to_numpy(dtype=bool)]
 
 
 def filter_by_doctor(df: pd.DataFrame, doctor: str) -> pd.DataFrame:
     col = "DR." if "DR." in df.columns else "Doctor"
     if col not in df.columns:
         return pd.DataFrame(columns=df.columns)
-    return df[df[col].astype(str).str.strip().str.upper() == doctor.strip().upper()].copy()
+    return df[(upper_column(df, col) == doctor.strip().upper()).to_numpy(dtype=bool)]
 
 
-def update_status(df: pd.DataFrame, row_id: str, new_status: str) -> pd.DataFrame:
-    from config.settings import IST
-    from datetime import datetime
-    if "REMINDER_ROW_ID" not in df.columns:
-        return df
-    mask = df["REMINDER_ROW_ID"].astype(str) == str(row_id)
-    if not mask.any():
+def update_status(df: pd.DataFrame, row_id: str, new_status: str, now: Optional[datetime] = None) -> pd.DataFrame:
+    """Set STATUS (and its timestamps) on one row of the session-owned ``df`` in place."""
+    pos = find_row_position(df, row_id)
+    if pos is None:
         return df
-    df = df.copy()
-    now_str = datetime.now(IST).strftime("%Y-%m-%d %H:%M:%S")
-    df.loc[mask, "STATUS"] = new_status
-    df.loc[mask, "STATUS_CHANGED_AT"] = now_str
+    label = df.index[pos]
+    now_str = (now or now_ist()).strftime("%Y-%m-%d %H:%M:%S")
+    df.loc[label, "STATUS"] = new_status
+    df.loc[label, "STATUS_CHANGED_AT"] = now_str
+    df.attrs.pop(CONTENT_VERSION_ATTR, None)
+    cached = df.attrs.get(TERMINAL_MASK_ATTR)
+    if isinstance(cached, _TerminalMask) and cached.index is df.index:
+        cached.values[pos] = str(new_status).strip().upper() in TERMINAL_STATUSES
     if new_status in {"ON GOING", "ARRIVED"}:
-        df.loc[mask, "ACTUAL_START_AT"] = now_str
+        df.loc[label, "ACTUAL_START_AT"] = now_str
     elif new_status in TERMINAL_STATUSES:
-        df.loc[mask, "ACTUAL_END_AT"] = now_str
+        df.loc[label, "ACTUAL_END_AT"] = now_str
     return df
 
 
+def _active_rows(df: pd.DataFrame) -> np.ndarray:
+    """Boolean mask of rows whose STATUS is not terminal."""
+    return ~terminal_mask(df)
+
+
+def _assignment_slots(df: pd.DataFrame, rows: np.ndarray) -> pd.DataFrame:
+    """Long ``(row, role, name)`` table of non-blank FIRST/SECOND/Third cells, in role order."""
+    parts = []
+    for col in _ASSIGNMENT_COLUMNS:
+        if col not in df.columns:
+            continue
+        names = upper_column(df, col).to_numpy()[rows]
+        parts.append(pd.DataFrame({"row": rows, "role": col, "name": names}))
+    if not parts:
+        return pd.DataFrame({"row": [], "role": [], "name": []})
+    slots = pd.concat(parts, ignore_index=True)
+    return slots[slots["name"] != ""]
+
+
 def get_assistant_loads(df_schedule: pd.DataFrame, exclude_row_id: Optional[str] = None) -> dict[str, int]:
-    loads: dict[str, int] = {}
     if df_schedule is None or df_schedule.empty:
-        return loads
-    for _, row in df_schedule.iterrows():
-        if exclude_row_id:
-            rid = str(row.get("REMINDER_ROW_ID", "")).strip()
-            if rid == str(exclude_row_id).strip():
-                continue
-        status = str(row.get("STATUS", "")).strip().upper()
-        if status in TERMINAL_STATUSES:
-            continue
-        for col in ["FIRST", "SECOND", "Third"]:
-            if col in row.index:
-                val = str(row.get(col, "")).strip().upper()
-                if val:
-                    loads[val] = loads.get(val, 0) + 1
-    return loads
+        return {}
+    active = _active_rows(df_schedule)
+    if exclude_row_id and "REMINDER_ROW_ID" in df_schedule.columns:
+        excluded = _row_id_strings(df_schedule).eq(str(exclude_row_id).strip()).fillna(False)
+        active &= ~excluded.to_numpy(dtype=bool)
+    slots = _assignment_slots(df_schedule, np.flatnonzero(active))
+    return {name: int(n) for name, n in slots["name"].value_counts().items()}
 
 
 def remove_assistant_from_schedule(df: pd.DataFrame, assistant_name: str) -> Optional[pd.DataFrame]:
     if df is None or df.empty:
         return None
     assist_upper = str(assistant_name).strip().upper()
+    masks = {
+        col: (upper_column(df, col) == assist_upper).to_numpy(dtype=bool)
+        for col in _ASSIGNMENT_COLUMNS if col in df.columns
+    }
+    masks = {col: mask for col, mask in masks.items() if mask.any()}
+    if not masks:
+        return None
     df_updated = df.copy()
-    changed = False
-    for col in ["FIRST", "SECOND", "Third"]:
-        if col not in df_updated.columns:
-            continue
-        mask = df_updated[col].astype(str).str.strip().str.upper() == assist_upper
-        if mask.any():
-            df_updated.loc[mask, col] = ""
-            changed = True
-    return df_updated if changed else None
+    for col, mask in masks.items():
+        df_updated.loc[mask, col] = ""
+    forget_upper_columns(df_updated, masks)
+    return df_updated
 
 
 def compute_workload_summary(df_schedule: pd.DataFrame, assistants: list[str]) -> pd.DataFrame:
     """Compute workload including appointment count and hours busy/available (9 AM - 7 PM = 10 hours)."""
     CLINIC_HOURS = 10  # 9 AM to 7 PM
-    rows = []
-    for a in assistants:
-        a_upper = a.strip().upper()
-        total = as_first = as_second = as_third = 0
-        total_minutes_busy = 0
-
-        for _, row in df_schedule.iterrows():
-            if str(row.get("STATUS", "")).upper() in TERMINAL_STATUSES:
-                continue
-
-            is_assigned = False
-            if str(row.get("FIRST", "")).strip().upper() == a_upper:
-                total += 1; as_first += 1
-                is_assigned = True
-            elif str(row.get("SECOND", "")).strip().upper() == a_upper:
-                total += 1; as_second += 1
-                is_assigned = True
-            elif str(row.get("Third", "")).strip().upper() == a_upper:
-                total += 1; as_third += 1
-                is_assigned = True
-
-            # Calculate appointment duration
-            if is_assigned:
-                in_min = row.get("In_min")
-                out_min = row.get("Out_min")
-                if in_min is not None and out_min is not None and out_min > in_min:
-                    duration = out_min - in_min
-                    total_minutes_busy += duration
-
-        hours_busy = total_minutes_busy / 60
-        hours_available = CLINIC_HOURS - hours_busy
-        overtime_hours = max(0, hours_busy - CLINIC_HOURS)
-
-        rows.append({
-            "Assistant": a,
-            "Appointments": total,
-            "Hours Busy": round(hours_busy, 2),
-            "Hours Available": round(max(0, hours_available), 2),
-            "Overtime (After 7 PM)": round(overtime_hours, 2),
-            "As First": as_first,
-            "As Second": as_second,
-            "As Third": as_third,
-        })
-    return pd.DataFrame(rows)
+    if not assistants:
+        return pd.DataFrame()
+    slots = _assignment_slots(df_schedule, np.flatnonzero(_active_rows(df_schedule)))
+    # An assistant listed in several roles on one appointment counts once, under the first role.
+    slots = slots.drop_duplicates(["row", "name"])
+
+    if "In_min" in df_schedule.columns and "Out_min" in df_schedule.columns:
+        in_min = pd.to_numeric(df_schedule["In_min"], errors="coerce")
+        out_min = pd.to_numeric(df_schedule["Out_min"], errors="coerce")
+        durations = (out_min - in_min).to_numpy(dtype="float64")
+        durations = np.where(durations > 0, durations, 0.0)
+    else:
+        durations = np.zeros(len(df_schedule))
+    slots = slots.assign(busy=durations[slots["row"].to_numpy(dtype="int64")])
+
+    keys = [a.strip().upper() for a in assistants]
+    by_role = pd.crosstab(slots["name"], slots["role"]).reindex(index=keys, columns=list(_ASSIGNMENT_COLUMNS), fill_value=0)
+    busy = slots.groupby("name")["busy"].sum().reindex(keys, fill_value=0.0)
+
+    hours_busy = busy.to_numpy() / 60
+    summary = pd.DataFrame({
+        "Assistant": assistants,
+        "Appointments": by_role.sum(axis=1).to_numpy(),
+        "Hours Busy": hours_busy.round(2),
+        "Hours Available": np.maximum(0, CLINIC_HOURS - hours_busy).round(2),
+        "Overtime (After 7 PM)": np.maximum(0, hours_busy - CLINIC_HOURS).round(2),
+        "As First": by_role["FIRST"].to_numpy(),
+        "As Second": by_role["SECOND"].to_numpy(),
+        "As Third": by_role["Third"].to_numpy(),
+    })
+    return summary
@@ -3,7 +3,18 @@
 
 from __future__ import annotations
 from datetime import time as time_type, datetime, timezone, timedelta
+from functools import lru_cache
+from pathlib import Path
 from typing import Any, Optional
+import json
+import pandas as pd
+
+_orjson_available = False
+try:
+    import orjson  # type: ignore
+    _orjson_available = True
+except Exception:
+    pass
 
 IST = timezone(timedelta(hours=5, minutes=30))
 
@@ -112,19 +123,26 @@ def time_to_12h(t: Optional[time_type]) -> str:
     return f"{hour_12}:{minute:02d} {period}"
 
 
+_BLANK_STRINGS = frozenset({"", "nan", "none", "nat"})
+
+
 def is_blank(value: Any) -> bool:
     """Return True if value is effectively empty/null."""
     if value is None:
         return True
+    if isinstance(value, str):
+        return value.strip().lower() in _BLANK_STRINGS
+    if isinstance(value, float):
+        return value != value
     try:
-        import pandas as pd
         if pd.isna(value):
             return True
     except Exception:
         pass
-    return str(value).strip().lower() in ("", "nan", "none", "nat")
+    return str(value).strip().lower() in _BLANK_STRINGS
 
 
+@lru_cache(maxsize=4096)
 def norm_name(name: str) -> str:
     """Normalize a staff name to a lookup key."""
     return str(name or "").strip().upper().replace("DR.", "").replace("DR ", "").strip()
@@ -151,11 +169,50 @@ def safe_int(value: Any, default: int = 0) -> int:
 def parse_iso_ts(value: Any) -> Optional[datetime]:
     if not value:
         return None
-    try:
+    if isinstance(value, str):
+        s = value.strip()
+        # Cheap shape check (YYYY-MM-DD or basic YYYYMMDD) so blank/legacy
+        # strings skip the raising parser.
+        if len(s) < 8 or not (s[:8].isdigit() or (len(s) >= 10 and s[4] == "-" and s[7] == "-")):
+            return None
+    else:
         s = str(value).strip()
+    try:
         dt = datetime.fromisoformat(s)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=IST)
-        return dt
     except Exception:
         return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=IST)
+    return dt
+
+
+def load_json_file(path: Path) -> Any:
+    """Parse a JSON file from its raw bytes, using orjson when it is installed."""
+    raw = path.read_bytes()
+    if _orjson_available:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+ALLOC_CONFIG_PATH = Path(__file__).parent.parent / "allocation_rules.json"
+
+
+def load_alloc_config() -> dict[str, Any]:
+    """Parsed allocation_rules.json, re-read only when the file's mtime changes.
+
+    The same dict is returned until the file changes, so callers must not mutate it.
+    """
+    try:
+        mtime_ns = ALLOC_CONFIG_PATH.stat().st_mtime_ns
+    except OSError:
+        return {}
+    return _load_alloc_config_cached(mtime_ns)
+
+
+@lru_cache(maxsize=1)
+def _load_alloc_config_cached(mtime_ns: int) -> dict[str, Any]:
+    try:
+        data = load_json_file(ALLOC_CONFIG_PATH)
+    except Exception:
+        return {}
+    return data if isinstance(data, dict) else {}
@@ -5,33 +5,23 @@ from __future__ import annotations
 import time as time_module
 import streamlit as st
 
-from config.settings import USE_SUPABASE
+from config.settings import USE_SUPABASE, SAVE_BATCH_MAX_CHANGES
+from services.schedule_ops import CONTENT_VERSION_ATTR
 
 
 def _get_meta(df) -> dict:
-    try:
-        if hasattr(df, "attrs"):
-            meta = df.attrs.get("meta")
-            if isinstance(meta, dict):
-                return dict(meta)
-    except Exception:
-        pass
-    return {}
+    """A private copy of the frame's ``attrs['meta']``; write it back with _set_meta."""
+    meta = df.attrs.get("meta")
+    return dict(meta) if isinstance(meta, dict) else {}
 
 
 def _set_meta(df, meta: dict) -> None:
-    try:
-        if hasattr(df, "attrs"):
-            df.attrs["meta"] = dict(meta or {})
-    except Exception:
-        pass
+    df.attrs["meta"] = meta
 
 
-def _apply_time_blocks_to_meta(meta: dict) -> dict:
+def _apply_time_blocks_to_meta(meta: dict) -> None:
     from services.availability import serialize_time_blocks
-    out = dict(meta or {})
-    out["time_blocks"] = serialize_time_blocks(st.session_state.get("time_blocks", []))
-    return out
+    meta["time_blocks"] = serialize_time_blocks(st.session_state.get("time_blocks", []))
 
 
 def sync_time_blocks_from_meta(df) -> None:
@@ -46,15 +36,42 @@ def sync_time_blocks_from_meta(df) -> None:
 
 
 def queue_unsaved(df, reason: str = "") -> None:
-    try:
-        st.session_state.unsaved_df = df.copy(deep=False)
-    except Exception:
-        st.session_state.unsaved_df = df
+    # A reference is enough: edits go through helpers that either write the
+    # session frame in place or return a new frame, and the version is bumped below.
+    st.session_state.unsaved_df = df
     st.session_state.unsaved_df_version = int(st.session_state.get("unsaved_df_version", 0)) + 1
+    st.session_state.pending_change_count = int(st.session_state.get("pending_change_count", 0)) + 1
     st.session_state.pending_changes = True
     st.session_state.pending_changes_reason = reason
 
 
+def _clear_pending() -> None:
+    st.session_state.unsaved_df = None
+    st.session_state.pending_changes = False
+    st.session_state.pending_changes_reason = ""
+    st.session_state.pending_change_count = 0
+
+
+def flush_pending_save() -> bool:
+    """Persist changes queued by maybe_save once the debounce window has passed.
+
+    Called once per rerun so a burst of edits is written in a single save.
+    """
+    if not st.session_state.get("pending_changes") or not st.session_state.get("auto_save_enabled", False):
+        return False
+    if st.session_state.get("is_saving") or st.session_state.get("save_conflict"):
+        return False
+    unsaved = st.session_state.get("unsaved_df")
+    if unsaved is None:
+        return False
+    debounce = float(st.session_state.get("save_debounce_seconds", 0) or 0)
+    last_at = float(st.session_state.get("last_save_at", 0.0) or 0.0)
+    if (time_module.time() - last_at) < debounce:
+        return False
+    reason = st.session_state.get("pending_changes_reason", "") or "Saved!"
+    return maybe_save(unsaved, show_toast=False, message=reason, force=True)
+
+
 def save_now(df, show_toast: bool = True, message: str = "Saved!", ignore_conflict: bool = False) -> bool:
     """Persist the DataFrame. Handles conflict detection via save_version comparison."""
     from data.schedule_repo import save_schedule, fetch_remote_save_version, compute_schedule_hash
@@ -66,7 +83,7 @@ def save_now(df, show_toast: bool = True, message: str = "Saved!", ignore_confli
     st.session_state.is_saving = True
     try:
         meta = _get_meta(df)
-        meta = _apply_time_blocks_to_meta(meta)
+        _apply_time_blocks_to_meta(meta)
         loaded_version = st.session_state.get("loaded_save_version")
         local_version = _safe_int(meta.get("save_version"), None)
         if local_version is None and loaded_version is not None:
@@ -85,8 +102,13 @@ def save_now(df, show_toast: bool = True, message: str = "Saved!", ignore_confli
                     st.error("⚠️ Save blocked: newer data detected remotely. Reload to sync.")
                     return False
 
+        # Unedited since the last successful save: skip hashing the whole frame.
+        token = df.attrs.get(CONTENT_VERSION_ATTR)
+        if token is not None and token is st.session_state.get("last_saved_content_version"):
+            return True
         current_hash = compute_schedule_hash(df)
         if current_hash == st.session_state.get("last_saved_hash"):
+            _stamp_saved_content(df)
             return True
 
         base_version = max(
@@ -103,6 +125,7 @@ def save_now(df, show_toast: bool = True, message: str = "Saved!", ignore_confli
             if show_toast:
                 st.toast(message, icon="✅")
             st.session_state.last_saved_hash = current_hash
+            _stamp_saved_content(df)
             st.session_state.loaded_save_version = meta["save_version"]
             st.session_state.loaded_save_at = meta["saved_at"]
             st.session_state.save_conflict = None
@@ -115,6 +138,12 @@ def save_now(df, show_toast: bool = True, message: str = "Saved!", ignore_confli
         st.session_state.is_saving = False
 
 
+def _stamp_saved_content(df) -> None:
+    token = object()
+    df.attrs[CONTENT_VERSION_ATTR] = token
+    st.session_state.last_saved_content_version = token
+
+
 def maybe_save(df, show_toast: bool = True, message: str = "Saved!", force: bool = False, ignore_conflict: bool = False) -> bool:
     """Respect auto-save toggle and debounce."""
     if st.session_state.get("is_saving"):
@@ -123,9 +152,7 @@ def maybe_save(df, show_toast: bool = True, message: str = "Saved!", force: bool
     if force:
         result = save_now(df, show_toast=show_toast, message=message, ignore_conflict=ignore_conflict)
         if result:
-            st.session_state.unsaved_df = None
-            st.session_state.pending_changes = False
-            st.session_state.pending_changes_reason = ""
+            _clear_pending()
         else:
             queue_unsaved(df, reason=message)
         return result
@@ -133,13 +160,13 @@ def maybe_save(df, show_toast: bool = True, message: str = "Saved!", force: bool
         debounce = float(st.session_state.get("save_debounce_seconds", 0) or 0)
         if debounce > 0:
             last_at = float(st.session_state.get("last_save_at", 0.0) or 0.0)
-            if (time_module.time() - last_at) < debounce:
+            queued = int(st.session_state.get("pending_change_count", 0))
+            if (time_module.time() - last_at) < debounce and queued + 1 < SAVE_BATCH_MAX_CHANGES:
                 queue_unsaved(df, reason=message)
                 return True
         result = save_now(df, show_toast=show_toast, message=message, ignore_conflict=ignore_conflict)
         if result:
-            st.session_state.unsaved_df = None
-            st.session_state.pending_changes = False
+            _clear_pending()
         else:
             queue_unsaved(df, reason=message)
         return result
@@ -2,6 +2,7 @@
 """Centralised session state: schema, initialisation, typed accessors."""
 
 from __future__ import annotations
+import copy
 from typing import Any
 
 # ── State Schema ──────────────────────────────────────────────────────────────
@@ -19,6 +20,7 @@ STATE_SCHEMA: dict[str, Any] = {
     "current_user_id": None,
     "show_reset_password": False,
     "allowed_functions": [],
+    "allowed_functions_set": None,
     "permissions_loaded_for": None,
 
     # Schedule data
@@ -26,6 +28,7 @@ STATE_SCHEMA: dict[str, Any] = {
     "unsaved_df": None,
     "pending_changes": False,
     "pending_changes_reason": "",
+    "pending_change_count": 0,
 
     # Save / conflict
     "is_saving": False,
@@ -33,6 +36,7 @@ STATE_SCHEMA: dict[str, Any] = {
     "save_debounce_seconds": 2,
     "last_save_at": 0.0,
     "last_saved_hash": None,
+    "last_saved_content_version": None,
     "loaded_save_version": None,
     "loaded_save_at": None,
     "save_conflict": None,
@@ -78,9 +82,13 @@ STATE_SCHEMA: dict[str, Any] = {
 def init_session_state() -> None:
     """Initialise all session state keys with defaults (idempotent)."""
     import streamlit as st
-    for key, default in STATE_SCHEMA.items():
-        if key not in st.session_state:
-            st.session_state[key] = default
+    missing = {
+        key: copy.deepcopy(default) if isinstance(default, (list, dict)) else default
+        for key, default in STATE_SCHEMA.items()
+        if key not in st.session_state
+    }
+    if missing:
+        st.session_state.update(missing)
 
 
 def get_state(key: str, default: Any = None) -> Any:
@@ -0,0 +1,53 @@
+"""Regression checks for services.allocation_engine.auto_allocate_all."""
+
+import random
+
+import pandas as pd
+import pytest
+
+from services import allocation_engine
+from services.schedule_ops import prepare_schedule
+
+ASSISTANTS = [f"ASST{i}" for i in range(1, 7)]
+
+
+@pytest.fixture
+def load_balanced_engine(monkeypatch):
+    config = {
+        "global": {"cross_department_fallback": False, "load_balance": True},
+        "departments": {},
+    }
+    monkeypatch.setattr(allocation_engine, "load_alloc_config", lambda: config)
+    monkeypatch.setattr(allocation_engine, "get_all_assistants", lambda *a, **k: list(ASSISTANTS))
+    monkeypatch.setattr(allocation_engine, "get_assistants_for_department", lambda *a, **k: list(ASSISTANTS))
+    monkeypatch.setattr(allocation_engine, "get_department_for_doctor", lambda *a, **k: "GENERAL")
+
+
+def _schedule(seed: int) -> pd.DataFrame:
+    rng = random.Random(seed)
+    rows = []
+    for i in range(30):
+        start = rng.randrange(9 * 60, 18 * 60, 15)
+        end = start + rng.choice((30, 45, 60, 90))
+        rows.append({
+            "DATE": "2026-10-17",
+            "REMINDER_ROW_ID": f"row-{i}",
+            "DR.": rng.choice(("DR A", "DR B", "DR C")),
+            "In Time": f"{start // 60:02d}:{start % 60:02d}",
+            "Out Time": f"{end // 60:02d}:{end % 60:02d}",
+            "FIRST": rng.choice(["", "", ASSISTANTS[0]]),
+            "SECOND": "",
+            "Third": "",
+            "STATUS": rng.choice(("WAITING", "ARRIVED", "DONE")),
+        })
+    return pd.DataFrame(rows)
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_prepared_and_raw_frames_allocate_identically(load_balanced_engine, seed):
+    raw_df, raw_changed = allocation_engine.auto_allocate_all(_schedule(seed))
+    prepared_df, prepared_changed = allocation_engine.auto_allocate_all(prepare_schedule(_schedule(seed)))
+
+    assert prepared_changed == raw_changed
+    for col in ("FIRST", "SECOND", "Third"):
+        assert prepared_df[col].astype(str).tolist() == raw_df[col].astype(str).tolist()
@@ -0,0 +1,115 @@
+"""Behavioral checks for services.reminder_service.get_due_reminders."""
+
+import random
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+from config.constants import TERMINAL_STATUSES
+from config.settings import IST
+from services.reminder_service import REMINDER_ADVANCE_MINUTES, get_due_reminders
+from services.utils import coerce_to_time_obj, parse_iso_ts
+
+NOW = datetime(2026, 10, 17, 10, 0, tzinfo=IST)
+
+
+def _row(row_id: str, in_time: str, **extra) -> dict:
+    row = {
+        "DATE": "2026-10-17",
+        "REMINDER_ROW_ID": row_id,
+        "Patient Name": f"Patient {row_id}",
+        "DR.": "DR A",
+        "OP": "OP 1",
+        "In Time": in_time,
+        "Out Time": "11:30",
+        "STATUS": "WAITING",
+        "REMINDER_DISMISSED": "",
+        "REMINDER_SNOOZE_UNTIL": "",
+    }
+    row.update(extra)
+    return row
+
+
+def _reference_due(df: pd.DataFrame, now: datetime) -> list[tuple]:
+    """The original row-by-row loop, kept as the behavioral reference."""
+    current_min = now.hour * 60 + now.minute
+    due = []
+    for _, row in df.iterrows():
+        status = str(row.get("STATUS", "")).strip().upper()
+        if status in TERMINAL_STATUSES:
+            continue
+        if str(row.get("REMINDER_DISMISSED", "")).strip().lower() in {"1", "true", "yes"}:
+            continue
+        snooze_until = str(row.get("REMINDER_SNOOZE_UNTIL", "")).strip()
+        if snooze_until:
+            snooze_dt = parse_iso_ts(snooze_until)
+            if snooze_dt and snooze_dt > now:
+                continue
+        in_obj = coerce_to_time_obj(row.get("In Time"))
+        if in_obj is None:
+            continue
+        minutes_until = in_obj.hour * 60 + in_obj.minute - current_min
+        if 0 <= minutes_until <= REMINDER_ADVANCE_MINUTES:
+            due.append((str(row.get("REMINDER_ROW_ID", "")).strip(), minutes_until, status))
+    return due
+
+
+def _due_ids(rows: list[dict]) -> list[str]:
+    return [r["row_id"] for r in get_due_reminders(pd.DataFrame(rows), now=NOW)]
+
+
+def test_active_snooze_is_excluded_and_expired_snooze_is_included():
+    rows = [
+        _row("snoozed", "10:05", REMINDER_SNOOZE_UNTIL="2026-10-17T10:05:00+05:30"),
+        _row("expired", "10:05", REMINDER_SNOOZE_UNTIL="2026-10-17T09:55:00+05:30"),
+        _row("plain", "10:05"),
+    ]
+    assert _due_ids(rows) == ["expired", "plain"]
+
+
+def test_dismissed_and_terminal_rows_are_excluded():
+    rows = [
+        _row("dismissed", "10:05", REMINDER_DISMISSED="1"),
+        _row("dismissed_word", "10:05", REMINDER_DISMISSED=" Yes "),
+        _row("done", "10:05", STATUS="DONE"),
+        _row("padded_cancel", "10:05", STATUS=" cancelled "),
+        _row("arrived", "10:05", STATUS="ARRIVED"),
+    ]
+    assert _due_ids(rows) == ["arrived"]
+
+
+def test_window_is_zero_to_fifteen_minutes_inclusive():
+    rows = [
+        _row("past", "09:59"),
+        _row("now", "10:00"),
+        _row("edge", "10:15"),
+        _row("late", "10:16"),
+        _row("pm_form", "10:10 AM"),
+        _row("blank", ""),
+    ]
+    assert _due_ids(rows) == ["now", "edge", "pm_form"]
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_matches_row_by_row_reference(seed):
+    rng = random.Random(seed)
+    rows = []
+    for i in range(40):
+        minute = rng.randrange(9 * 60 + 30, 10 * 60 + 30)
+        if rng.random() < 0.2:
+            in_time = f"{(minute // 60 - 1) % 12 + 1}:{minute % 60:02d} {'AM' if minute < 720 else 'PM'}"
+        else:
+            in_time = f"{minute // 60:02d}:{minute % 60:02d}"
+        snooze = rng.choice(["", "", "", NOW + timedelta(minutes=5), NOW - timedelta(minutes=5)])
+        rows.append(_row(
+            f"r{i}",
+            in_time,
+            STATUS=rng.choice(["WAITING", "ARRIVED", "DONE", " done ", "ON GOING", ""]),
+            REMINDER_DISMISSED=rng.choice(["", "", "1", "true", "0"]),
+            REMINDER_SNOOZE_UNTIL=snooze.isoformat() if snooze else "",
+        ))
+    df = pd.DataFrame(rows)
+
+    got = [(r["row_id"], r["minutes_until"], r["status"]) for r in get_due_reminders(df, now=NOW)]
+    assert got == _reference_due(df, NOW)
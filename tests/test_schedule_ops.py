@@ -0,0 +1,89 @@
+"""Parity checks for services.schedule_ops computed columns and filters."""
+
+import random
+from datetime import datetime, time
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from config.constants import TERMINAL_STATUSES
+from config.settings import IST
+from services.schedule_ops import add_computed_columns, filter_upcoming, prepare_schedule
+from services.utils import is_blank, time_to_minutes
+
+NOW = datetime(2026, 10, 17, 10, 0, tzinfo=IST)
+
+TIME_VALUES = [
+    "10:15", "9:05", " 09:05 ", "10:15:30", "10.15", "9.5", "10:15 AM", "12:00 PM",
+    "12:30 AM", "1:45 pm", "", "  ", None, np.nan, "25:00", "10:75", "abc",
+    time(10, 15), 10.5, datetime(2026, 10, 17, 10, 15),
+]
+
+
+def _reference_minutes(value) -> float:
+    """Baseline ``In_min``: the scalar parser applied cell by cell."""
+    if is_blank(value):
+        return np.nan
+    mins = time_to_minutes(value)
+    return np.nan if mins is None else float(mins)
+
+
+def _schedule(in_times: list, statuses: list | None = None) -> pd.DataFrame:
+    n = len(in_times)
+    return pd.DataFrame({
+        "DATE": ["2026-10-17"] * n,
+        "REMINDER_ROW_ID": [f"row-{i}" for i in range(n)],
+        "In Time": pd.Series(in_times, dtype=object),
+        "Out Time": ["11:30"] * n,
+        "STATUS": statuses if statuses is not None else ["WAITING"] * n,
+    })
+
+
+def _upcoming_ids(df: pd.DataFrame, minutes_ahead: int = 60) -> list[str]:
+    return filter_upcoming(prepare_schedule(df, NOW), minutes_ahead, now=NOW)["REMINDER_ROW_ID"].tolist()
+
+
+def test_in_min_matches_scalar_parser():
+    df = add_computed_columns(_schedule(TIME_VALUES), NOW)
+    expected = [_reference_minutes(v) for v in TIME_VALUES]
+    np.testing.assert_array_equal(df["In_min"].to_numpy(dtype="float64"), np.array(expected, dtype="float64"))
+
+
+def test_upcoming_window_is_open_at_now_and_closed_at_the_far_bound():
+    df = _schedule(["10:00", "10:01", "11:00", "11:01", "09:59"])
+    assert _upcoming_ids(df) == ["row-1", "row-2"]
+
+
+def test_upcoming_accepts_decimal_and_am_pm_times():
+    df = _schedule(["10.15", "10:30 AM", "10:30 PM", "9.5"])
+    assert _upcoming_ids(df) == ["row-0", "row-1"]
+
+
+def test_padded_terminal_status_is_excluded():
+    df = _schedule(["10:10", "10:20", "10:30"], statuses=[" done ", "Cancelled", "WAITING"])
+    assert _upcoming_ids(df) == ["row-2"]
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_upcoming_matches_in_min_window(seed):
+    rng = random.Random(seed)
+    in_times, statuses = [], []
+    for _ in range(60):
+        minute = rng.randrange(9 * 60, 12 * 60)
+        in_times.append(rng.choice([
+            f"{minute // 60:02d}:{minute % 60:02d}",
+            f"{(minute // 60 - 1) % 12 + 1}:{minute % 60:02d} {'AM' if minute < 720 else 'PM'}",
+            f"{minute // 60}.{minute % 60 * 100 // 60:02d}",
+            "",
+        ]))
+        statuses.append(rng.choice(["WAITING", "ARRIVED", "DONE", " done ", "ON GOING"]))
+    df = _schedule(in_times, statuses)
+
+    current_min = NOW.hour * 60 + NOW.minute
+    in_min = pd.Series([_reference_minutes(v) for v in in_times])
+    terminal = pd.Series(statuses).str.strip().str.upper().isin(TERMINAL_STATUSES)
+    window = in_min.notna() & (in_min > current_min) & (in_min <= current_min + 60) & ~terminal
+    expected = df.loc[window, "REMINDER_ROW_ID"].tolist()
+
+    assert _upcoming_ids(df) == expected